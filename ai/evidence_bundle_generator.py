@@ -15,10 +15,13 @@ import json
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+from collections import OrderedDict
+from operator import attrgetter, mul
+from dataclasses import dataclass, fields
 from pathlib import Path
 import hashlib
+import time
 import uuid
 
 # PDF generation
@@ -33,9 +36,18 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from PIL import Image as PILImage
 import base64
 import io
+from xml.sax.saxutils import escape
 
 # Web3 and blockchain
-from web3 import Web3
+from web3 import Web3, AsyncWeb3
+from web3.providers.async_rpc import AsyncHTTPProvider
+from hexbytes import HexBytes
+
+# Direct Keccak-256 from pycryptodome, skipping Web3.keccak's dispatch layer when available
+try:
+    from Crypto.Hash import keccak
+except ImportError:
+    keccak = None
 import requests
 import aiohttp
 
@@ -43,12 +55,118 @@ import aiohttp
 import sqlite3
 from contextlib import contextmanager
 
+# Vectorized scoring of many bundles when NumPy is installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Incremental JSON parsing of large catalog responses when installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# C-accelerated JSON for stored bundle headers when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Evidence sections of a bundle in canonical order, as (source name, bundle attribute)
+EVIDENCE_FIELDS = (
+    ('blockchain', 'blockchain_evidence'),
+    ('satellite', 'satellite_evidence'),
+    ('drone', 'drone_evidence'),
+    ('legal', 'legal_evidence'),
+    ('government', 'government_records')
+)
+
+# Field holding when each kind of evidence was observed, stored with its evidence_sources row
+EVIDENCE_TIMESTAMP_FIELDS = {
+    'blockchain': 'timestamp',
+    'satellite': 'capture_date',
+    'drone': 'flight_date',
+    'legal': 'processing_timestamp',
+    'government': 'validity_date'
+}
+
+# Completeness points awarded per evidence source (sums to 100)
+COMPLETENESS_WEIGHTS = (
+    ('blockchain_evidence', 25),
+    ('satellite_evidence', 20),
+    ('drone_evidence', 20),
+    ('legal_evidence', 20),
+    ('government_records', 15)
+)
+_completeness_sources = attrgetter(*(attribute for attribute, _ in COMPLETENESS_WEIGHTS))
+_COMPLETENESS_VALUES = tuple(weight for _, weight in COMPLETENESS_WEIGHTS)
+
+# Contracts whose events make up a property's blockchain evidence
+EVENT_CONTRACTS = ('ulpin_registry', 'freeze_contract')
+
+# Blocks per log query page, and how many pages may be in flight at once
+BLOCK_PAGE_SIZE = 5000
+MAX_CONCURRENT_LOG_QUERIES = 8
+
+# Polygon produces a block roughly every 2 seconds
+BLOCKS_PER_DAY = 43200
+DEFAULT_EVIDENCE_DAYS = 365
+
+# Seconds to wait before re-checking Polygon connectivity after a failed check
+WEB3_RETRY_SECONDS = 30
+
+# Full pages at least this far below the head are final, and their events are cached.
+# Page keys include the ULPIN, so pages are only reused when the same property's
+# history is queried again (e.g. its bundle is regenerated); the first bundle for a
+# property always misses. The cache holds every page of the last
+# EVENT_PAGE_CACHE_PROPERTIES properties' default history across all event contracts
+# (about 6,300 pages per property at 5,000-block pages over 365 days).
+FINALIZED_BLOCK_DEPTH = 256
+EVENT_PAGES_PER_PROPERTY = len(EVENT_CONTRACTS) * (DEFAULT_EVIDENCE_DAYS * BLOCKS_PER_DAY // BLOCK_PAGE_SIZE + 2)
+EVENT_PAGE_CACHE_PROPERTIES = 4
+EVENT_PAGE_CACHE_SIZE = EVENT_PAGES_PER_PROPERTY * EVENT_PAGE_CACHE_PROPERTIES
+
+# Version of the integrity hash input format, stored with every bundle.
+# 1: json.dumps of the asdict() evidence lists (default=str)
+# 2: per-record canonical JSON from _record_bytes, sections framed as "<source>|...|"
+BUNDLE_HASH_VERSION = 2
+
+INSERT_BUNDLE_SQL = '''
+    INSERT INTO evidence_bundles 
+    (bundle_id, case_id, property_ulpin, creation_timestamp, bundle_data, completeness_score)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+INSERT_SOURCE_SQL = '''
+    INSERT INTO evidence_sources (bundle_id, source_type, source_data, timestamp)
+    VALUES (?, ?, ?, ?)
+'''
+
+# Block timestamps kept per aggregator (blocks are immutable, so entries never go stale)
+BLOCK_TIMESTAMP_CACHE_SIZE = 8192
+
+# Embedded report images are downscaled to this many pixels per side and re-encoded as JPEG
+PDF_IMAGE_MAX_PIXELS = 1600
+PDF_IMAGE_JPEG_QUALITY = 80
+
+# Case information table on the report title page
+CASE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (1, 0), (1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
 # Evidence Bundle Schema
-@dataclass
+@dataclass(slots=True)
 class BlockchainEvidence:
     contract_address: str
     transaction_hash: str
@@ -60,7 +178,7 @@ class BlockchainEvidence:
     gas_used: int
     transaction_value: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class SatelliteEvidence:
     image_url: str
     capture_date: datetime
@@ -70,7 +188,7 @@ class SatelliteEvidence:
     analysis_results: Dict[str, Any]
     change_detection: Optional[Dict[str, Any]] = None
 
-@dataclass
+@dataclass(slots=True)
 class DroneEvidence:
     validation_id: str
     flight_date: datetime
@@ -82,7 +200,7 @@ class DroneEvidence:
     swarm_participants: List[str]
     image_hashes: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class LegalEvidence:
     document_type: str
     document_hash: str
@@ -92,7 +210,7 @@ class LegalEvidence:
     processing_timestamp: datetime
     validation_status: str
 
-@dataclass
+@dataclass(slots=True)
 class GovernmentRecord:
     record_type: str  # revenue, survey, mutation
     record_number: str
@@ -101,7 +219,7 @@ class GovernmentRecord:
     verified_data: Dict[str, Any]
     digital_signature: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class EvidenceBundle:
     bundle_id: str
     case_id: str
@@ -116,6 +234,44 @@ class EvidenceBundle:
     completeness_score: float
     confidence_rating: str
     summary_analysis: Dict[str, Any]
+    integrity_hash_version: int = BUNDLE_HASH_VERSION
+
+# Non-evidence fields of a bundle, serialized ahead of the evidence sections
+BUNDLE_HEADER_FIELDS = tuple(
+    field.name for field in fields(EvidenceBundle)
+    if field.name not in {attribute for _, attribute in EVIDENCE_FIELDS}
+)
+
+def _keccak_tx(ulpin: str, index: int) -> HexBytes:
+    """Keccak-256 of the mock transaction label tx_<ulpin>_<index>"""
+    if keccak is None:
+        return Web3.keccak(text=f"tx_{ulpin}_{index}")
+    hasher = keccak.new(digest_bits=256)
+    hasher.update(b'tx_')
+    hasher.update(ulpin.encode())
+    hasher.update(b'_%d' % index)
+    return HexBytes(hasher.digest())
+
+def _json_default(value: Any) -> str:
+    """Fallback encoder shared by the orjson and json paths so both emit the same text"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _record_bytes(record: Any) -> bytes:
+    """
+    Serialize an evidence record as canonical compact JSON for hashing: fields in
+    declaration order, keys of nested dicts sorted, floats as repr() writes them.
+    Always the stdlib encoder, so the digest does not depend on optional packages;
+    NaN and infinity have no JSON form and raise ValueError.
+    """
+    return ('{' + ','.join(
+        json.dumps(field.name) + ':' + json.dumps(
+            getattr(record, field.name), sort_keys=True, separators=(',', ':'),
+            ensure_ascii=False, allow_nan=False, default=_json_default
+        )
+        for field in fields(record)
+    ) + '}').encode()
 
 class EvidenceAggregator:
     """
@@ -126,7 +282,16 @@ class EvidenceAggregator:
         self.config = config or {}
         
         # Initialize Web3 connection
+        self.rpc_url = self.config.get('polygon_rpc', 'https://polygon-rpc.com')
         self.w3 = self._init_web3_connection()
+        # HTTP session the provider currently uses, and connectivity check state
+        self._web3_session: Optional[aiohttp.ClientSession] = None
+        self._web3_connected = False
+        self._web3_retry_at = 0.0
+        # LRU of block number -> timestamp, filled by batched JSON-RPC lookups
+        self._block_timestamps: "OrderedDict[int, datetime]" = OrderedDict()
+        # LRU of finalized event pages keyed by (contract, first block, last block, ULPIN)
+        self._event_pages: "OrderedDict[Tuple[str, int, int, str], List[Dict]]" = OrderedDict()
         
         # Contract addresses (from previous sprints)
         self.contracts = {
@@ -142,25 +307,160 @@ class EvidenceAggregator:
             'government_api': 'https://api.revenue.gujarat.gov.in'
         }
         
-        # Evidence storage
-        self.evidence_db_path = "evidence_bundles.db"
+        # Shared HTTP session for API collectors (created lazily inside the event loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Evidence storage (one long-lived connection, opened on first use and closed by aclose)
+        self.evidence_db_path = self.config.get('database', {}).get('path', "evidence_bundles.db")
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        # Downscaled JPEG bytes and pixel size of report images, keyed by source content hash
+        self._image_cache: Dict[str, Tuple[bytes, Tuple[int, int]]] = {}
+        
+        # Report styles are built once and shared by every PDF this aggregator renders
+        self._styles = getSampleStyleSheet()
+        self._title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=self._styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER
+        )
         self._init_database()
 
-    def _init_web3_connection(self) -> Web3:
-        """Initialize Web3 connection to Polygon network"""
-        rpc_url = self.config.get('polygon_rpc', 'https://polygon-rpc.com')
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def _init_web3_connection(self) -> AsyncWeb3:
+        """Initialize async Web3 client for Polygon network (connectivity is checked on first use)"""
+        return AsyncWeb3(AsyncHTTPProvider(self.rpc_url, request_kwargs={'timeout': 10}))
+
+    async def _connected_web3(self) -> Optional[AsyncWeb3]:
+        """Return the Web3 client once it has reached the network, or None while it cannot"""
+        # Chain calls share the keep-alive session used by the API collectors,
+        # so the provider is re-pointed whenever that session is replaced
+        session = await self._ensure_session()
+        if self._web3_session is not session:
+            await self.w3.provider.cache_async_session(session)
+            self._web3_session = session
+        
+        if self._web3_connected:
+            return self.w3
+        if time.monotonic() < self._web3_retry_at:
+            return None
         
-        if not w3.is_connected():
-            logger.warning("Failed to connect to Polygon network")
+        if not await self.w3.is_connected():
+            logger.warning(f"Failed to connect to Polygon network, retrying in {WEB3_RETRY_SECONDS}s")
+            self._web3_retry_at = time.monotonic() + WEB3_RETRY_SECONDS
             return None
         
         logger.info("Connected to Polygon network")
-        return w3
+        self._web3_connected = True
+        return self.w3
+
+    async def _fetch_block_timestamp(self, block_number: int) -> datetime:
+        """Fetch the timestamp of a block from the chain"""
+        block = await self.w3.eth.get_block(block_number)
+        return datetime.fromtimestamp(block['timestamp'])
+
+    async def _get_block_timestamps(self, block_numbers: Iterable[int]) -> Dict[int, datetime]:
+        """
+        Resolve block timestamps, fetching uncached blocks in one JSON-RPC batch
+        """
+        wanted = set(block_numbers)
+        missing = sorted(wanted - self._block_timestamps.keys())
+        if missing:
+            self._block_timestamps.update(await self._fetch_block_timestamps_batch(missing))
+        
+        timestamps = {}
+        for number in wanted:
+            self._block_timestamps.move_to_end(number)
+            timestamps[number] = self._block_timestamps[number]
+        
+        while len(self._block_timestamps) > BLOCK_TIMESTAMP_CACHE_SIZE:
+            self._block_timestamps.popitem(last=False)
+        
+        return timestamps
+
+    async def _fetch_block_timestamps_batch(self, block_numbers: List[int]) -> Dict[int, datetime]:
+        """
+        Fetch block timestamps with a single eth_getBlockByNumber batch request
+        """
+        timestamps = {}
+        payload = [
+            {"jsonrpc": "2.0", "id": request_id, "method": "eth_getBlockByNumber", "params": [hex(number), False]}
+            for request_id, number in enumerate(block_numbers)
+        ]
+        
+        try:
+            session = await self._ensure_session()
+            async with session.post(self.rpc_url, json=payload) as response:
+                response.raise_for_status()
+                replies = await response.json()
+            
+            for reply in replies:
+                block = reply.get('result')
+                if block:
+                    timestamps[block_numbers[reply['id']]] = datetime.fromtimestamp(int(block['timestamp'], 16))
+        except Exception as e:
+            logger.warning(f"Batched block lookup failed, falling back to per-block calls: {e}")
+        
+        # Blocks the batch did not resolve are fetched individually
+        unresolved = [number for number in block_numbers if number not in timestamps]
+        if unresolved:
+            fetched = await asyncio.gather(*(self._fetch_block_timestamp(number) for number in unresolved))
+            timestamps.update(zip(unresolved, fetched))
+        
+        return timestamps
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared keep-alive HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=30)
+            )
+        return self._session
+
+    async def __aenter__(self) -> "EvidenceAggregator":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the shared HTTP session and the evidence database connection"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        # The provider held the closed session; the next chain call re-checks with a new one
+        self._web3_session = None
+        self._web3_connected = False
+        self.close()
+
+    def close(self):
+        """Close the evidence database connection (it is reopened on next use)"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the evidence database connection, opening it on first use"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.evidence_db_path, check_same_thread=False)
+            # WAL with synchronous=NORMAL may lose the last commits on power loss;
+            # acceptable since bundles can be regenerated from their sources
+            for pragma in (
+                'journal_mode=WAL',
+                'synchronous=NORMAL',
+                'temp_store=MEMORY',
+                'cache_size=-64000',
+                'mmap_size=268435456'
+            ):
+                conn.execute(f'PRAGMA {pragma}')
+            self._conn = conn
+        return self._conn
 
     def _init_database(self):
         """Initialize SQLite database for evidence storage"""
-        with sqlite3.connect(self.evidence_db_path) as conn:
+        with self._db() as conn:
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS evidence_bundles (
                     bundle_id TEXT PRIMARY KEY,
@@ -183,51 +483,47 @@ class EvidenceAggregator:
                     FOREIGN KEY (bundle_id) REFERENCES evidence_bundles (bundle_id)
                 )
             ''')
+            
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_evidence_bundles_case ON evidence_bundles (case_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_evidence_bundles_ulpin ON evidence_bundles (property_ulpin)')
 
-    async def collect_blockchain_evidence(self, property_ulpin: str, days_back: int = 365) -> List[BlockchainEvidence]:
+    async def collect_blockchain_evidence(self, property_ulpin: str, days_back: int = DEFAULT_EVIDENCE_DAYS) -> List[BlockchainEvidence]:
         """
         Collect blockchain evidence from smart contracts
         """
         evidence = []
         
-        if not self.w3:
+        if not await self._connected_web3():
             return evidence
         
         try:
             # Get current block number
-            current_block = self.w3.eth.block_number
+            current_block = await self.w3.eth.block_number
             
             # Calculate block range (approximate)
-            blocks_per_day = 43200  # Polygon ~2 second block time
-            from_block = current_block - (days_back * blocks_per_day)
-            
-            # Query ULPIN registry events
-            ulpin_events = await self._get_contract_events(
-                self.contracts['ulpin_registry'],
-                from_block,
-                current_block,
-                property_ulpin
-            )
+            from_block = max(current_block - (days_back * BLOCKS_PER_DAY), 0)
             
-            # Query freeze contract events
-            freeze_events = await self._get_contract_events(
-                self.contracts['freeze_contract'],
-                from_block,
-                current_block,
-                property_ulpin
-            )
+            # Query every event-bearing contract concurrently
+            contract_events = await asyncio.gather(*(
+                self._get_contract_events(
+                    self.contracts[contract],
+                    from_block,
+                    current_block,
+                    property_ulpin
+                )
+                for contract in EVENT_CONTRACTS
+            ))
             
             # Process events
-            all_events = ulpin_events + freeze_events
+            all_events = [event for events in contract_events for event in events]
+            timestamps = await self._get_block_timestamps(event['blockNumber'] for event in all_events)
             
             for event in all_events:
                 blockchain_evidence = BlockchainEvidence(
                     contract_address=event['address'],
                     transaction_hash=event['transactionHash'].hex(),
                     block_number=event['blockNumber'],
-                    timestamp=datetime.fromtimestamp(
-                        self.w3.eth.get_block(event['blockNumber'])['timestamp']
-                    ),
+                    timestamp=timestamps[event['blockNumber']],
                     event_type=event['event'],
                     parties_involved=event.get('args', {}).get('parties', []),
                     property_ulpin=property_ulpin,
@@ -245,32 +541,67 @@ class EvidenceAggregator:
 
     async def _get_contract_events(self, contract_address: str, from_block: int, to_block: int, ulpin: str) -> List[Dict]:
         """
-        Get events from smart contract for specific ULPIN
+        Get events from smart contract for specific ULPIN, paging the block
+        range so each log query stays small and pages run concurrently
+        """
+        # Pages are aligned to multiples of the page size so their cache keys
+        # stay stable as the head (and with it from_block) moves forward
+        first_page = from_block - from_block % BLOCK_PAGE_SIZE
+        ranges = [
+            (max(start, from_block), min(start + BLOCK_PAGE_SIZE - 1, to_block))
+            for start in range(first_page, to_block + 1, BLOCK_PAGE_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOG_QUERIES)
+        
+        async def fetch_page(start: int, end: int) -> List[Dict]:
+            key = (contract_address, start, end, ulpin)
+            if key in self._event_pages:
+                self._event_pages.move_to_end(key)
+                return self._event_pages[key]
+            
+            async with semaphore:
+                events = await self._get_contract_events_page(contract_address, start, end, ulpin, to_block)
+            
+            # Only whole pages of finalized history are immutable enough to cache
+            if end - start + 1 == BLOCK_PAGE_SIZE and end <= to_block - FINALIZED_BLOCK_DEPTH:
+                self._event_pages[key] = events
+                if len(self._event_pages) > EVENT_PAGE_CACHE_SIZE:
+                    self._event_pages.popitem(last=False)
+            return events
+        
+        pages = await asyncio.gather(*(fetch_page(start, end) for start, end in ranges))
+        return [event for page in pages for event in page]
+
+    async def _get_contract_events_page(self, contract_address: str, from_block: int, to_block: int,
+                                        ulpin: str, head_block: int) -> List[Dict]:
+        """
+        Get contract events within a single block page
         """
         # Simplified event collection (in real implementation, use contract ABI)
-        events = []
+        # Mock blockchain events for demonstration, anchored to the chain head
+        if to_block < head_block - 1000 or from_block > head_block - 500:
+            return []
         
-        # Mock blockchain events for demonstration
         mock_events = [
             {
                 'address': contract_address,
-                'transactionHash': Web3.keccak(text=f"tx_{ulpin}_1"),
-                'blockNumber': to_block - 1000,
+                'transactionHash': _keccak_tx(ulpin, 1),
+                'blockNumber': head_block - 1000,
                 'event': 'Transfer',
                 'args': {'parties': ['0x123...abc', '0x456...def'], 'ulpin': ulpin},
                 'gasUsed': 150000
             },
             {
                 'address': contract_address,
-                'transactionHash': Web3.keccak(text=f"tx_{ulpin}_2"),
-                'blockNumber': to_block - 500,
+                'transactionHash': _keccak_tx(ulpin, 2),
+                'blockNumber': head_block - 500,
                 'event': 'PropertyFreeze',
                 'args': {'parties': ['0x789...ghi'], 'ulpin': ulpin},
                 'gasUsed': 80000
             }
         ]
         
-        return mock_events
+        return [event for event in mock_events if from_block <= event['blockNumber'] <= to_block]
 
     async def collect_satellite_evidence(self, property_coordinates: Dict[str, float], months_back: int = 12) -> List[SatelliteEvidence]:
         """
@@ -313,6 +644,10 @@ class EvidenceAggregator:
         """
         Query satellite imagery API
         """
+        satellite_config = self.config.get('satellite', {})
+        if satellite_config.get('api_key'):
+            return await self._search_satellite_catalog(coordinates, start_date, end_date, satellite_config)
+        
         # Mock satellite data for demonstration
         mock_data = [
             {
@@ -335,6 +670,44 @@ class EvidenceAggregator:
         
         return mock_data
 
+    async def _search_satellite_catalog(self, coordinates: Dict[str, float], start_date: datetime, end_date: datetime, satellite_config: Dict[str, Any]) -> List[Dict]:
+        """
+        Search the STAC catalog for imagery covering the property
+        """
+        base_url = satellite_config.get('base_url', self.api_endpoints['satellite_api'])
+        lat, lon = coordinates['lat'], coordinates['lon']
+        params = {
+            'bbox': f"{lon - 0.01},{lat - 0.01},{lon + 0.01},{lat + 0.01}",
+            'datetime': f"{start_date.isoformat()}Z/{end_date.isoformat()}Z",
+            'limit': 50
+        }
+        headers = {'Authorization': f"Bearer {satellite_config['api_key']}"}
+        
+        session = await self._ensure_session()
+        async with session.get(f"{base_url}/api/v1/catalog/1.0.0/search", params=params, headers=headers) as response:
+            if ijson is not None:
+                # Parse features as the body streams in instead of buffering it whole
+                features = ijson.items_async(response.content, 'features.item', use_float=True)
+                records = [self._catalog_feature(feature) async for feature in features]
+            else:
+                payload = await response.json()
+                records = [self._catalog_feature(feature) for feature in payload.get('features', [])]
+        
+        # Features without a visual asset have no image to cite, so they are not evidence
+        return [record for record in records if record['url']]
+
+    @staticmethod
+    def _catalog_feature(feature: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a STAC catalog feature to the satellite record shape"""
+        return {
+            'url': feature.get('assets', {}).get('visual', {}).get('href'),
+            'date': feature['properties']['datetime'],
+            'satellite': feature['properties'].get('satellite', 'Sentinel-2'),
+            'resolution': feature['properties'].get('gsd', 10.0),
+            'cloud_coverage': feature['properties'].get('cloud_coverage', 0.0),
+            'analysis': {}
+        }
+
     async def collect_drone_evidence(self, property_ulpin: str) -> List[DroneEvidence]:
         """
         Collect drone validation evidence from swarm consensus
@@ -485,45 +858,58 @@ class EvidenceAggregator:
         """
         Calculate evidence bundle completeness score
         """
-        scores = []
-        
-        # Blockchain evidence (25 points)
-        if evidence_bundle.blockchain_evidence:
-            scores.append(25)
-        
-        # Satellite evidence (20 points)
-        if evidence_bundle.satellite_evidence:
-            scores.append(20)
-        
-        # Drone evidence (20 points)
-        if evidence_bundle.drone_evidence:
-            scores.append(20)
-        
-        # Legal evidence (20 points)
-        if evidence_bundle.legal_evidence:
-            scores.append(20)
-        
-        # Government records (15 points)
-        if evidence_bundle.government_records:
-            scores.append(15)
-        
-        return sum(scores)
+        # Weight times presence per source, summed without per-source branches
+        return sum(map(mul, _COMPLETENESS_VALUES, map(bool, _completeness_sources(evidence_bundle))))
+
+    def score_bundles(self, evidence_bundles: List[EvidenceBundle]) -> List[float]:
+        """
+        Completeness scores for many bundles at once, e.g. when ranking candidates
+        """
+        if np is None:
+            return [self.calculate_completeness_score(bundle) for bundle in evidence_bundles]
+        
+        # (N, sources) presence matrix times the weight vector
+        presence = np.fromiter(
+            (bool(source) for bundle in evidence_bundles for source in _completeness_sources(bundle)),
+            dtype=bool,
+            count=len(evidence_bundles) * len(_COMPLETENESS_VALUES)
+        ).reshape(-1, len(_COMPLETENESS_VALUES))
+        return (presence @ np.array(_COMPLETENESS_VALUES, dtype=np.int32)).tolist()
+
+    @staticmethod
+    def _evidence_sections(evidence_bundle: EvidenceBundle) -> Tuple[Tuple[str, List[Any]], ...]:
+        """
+        Evidence lists of a bundle in canonical order, keyed by source name
+        """
+        return tuple((source, getattr(evidence_bundle, attribute)) for source, attribute in EVIDENCE_FIELDS)
 
     def calculate_bundle_integrity_hash(self, evidence_bundle: EvidenceBundle) -> str:
         """
-        Calculate integrity hash for evidence bundle
+        Calculate integrity hash for evidence bundle (format BUNDLE_HASH_VERSION)
         """
-        # Create deterministic hash of all evidence
-        evidence_data = {
-            'blockchain': [asdict(e) for e in evidence_bundle.blockchain_evidence],
-            'satellite': [asdict(e) for e in evidence_bundle.satellite_evidence],
-            'drone': [asdict(e) for e in evidence_bundle.drone_evidence],
-            'legal': [asdict(e) for e in evidence_bundle.legal_evidence],
-            'government': [asdict(e) for e in evidence_bundle.government_records]
-        }
+        return self._serialize_and_hash(evidence_bundle)[1]
+
+    def _serialize_and_hash(self, evidence_bundle: EvidenceBundle) -> Tuple[Dict[str, List[bytes]], str]:
+        """
+        Serialize every evidence record and hash the result in the same pass.
+        The per-source record payloads are returned for reuse by storage.
+        """
+        # Hash one section at a time so peak memory is bounded by the largest section
+        hasher = hashlib.sha256()
+        payloads = {}
         
-        evidence_json = json.dumps(evidence_data, sort_keys=True, default=str)
-        return hashlib.sha256(evidence_json.encode()).hexdigest()
+        for source, records in self._evidence_sections(evidence_bundle):
+            payloads[source] = encoded = [_record_bytes(record) for record in records]
+            hasher.update(source.encode() + b'|')
+            hasher.update(b','.join(encoded))
+            hasher.update(b'|')
+        
+        return payloads, hasher.hexdigest()
+
+    @staticmethod
+    async def _no_evidence() -> List[Any]:
+        """Placeholder collector for sources that cannot be queried"""
+        return []
 
     async def generate_evidence_bundle(self, case_id: str, property_ulpin: str, property_coordinates: Dict[str, float] = None) -> EvidenceBundle:
         """
@@ -534,16 +920,30 @@ class EvidenceAggregator:
         
         logger.info(f"Generating evidence bundle for case {case_id}, property {property_ulpin}")
         
-        # Collect evidence from all sources
-        blockchain_evidence = await self.collect_blockchain_evidence(property_ulpin)
+        # Collect evidence from all sources concurrently
+        collectors = {
+            'blockchain': self.collect_blockchain_evidence(property_ulpin),
+            'satellite': (
+                self.collect_satellite_evidence(property_coordinates)
+                if property_coordinates else self._no_evidence()
+            ),
+            'drone': self.collect_drone_evidence(property_ulpin),
+            'legal': self.collect_legal_evidence(case_id),
+            'government': self.collect_government_records(property_ulpin)
+        }
+        results = await asyncio.gather(*collectors.values(), return_exceptions=True)
         
-        satellite_evidence = []
-        if property_coordinates:
-            satellite_evidence = await self.collect_satellite_evidence(property_coordinates)
+        # A failed source contributes no evidence rather than failing the bundle
+        collected = []
+        for source, result in zip(collectors, results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result  # cancellation and interpreter exits must propagate
+            if isinstance(result, Exception):
+                logger.error(f"{source.capitalize()} evidence collection failed: {result}")
+                result = []
+            collected.append(result)
         
-        drone_evidence = await self.collect_drone_evidence(property_ulpin)
-        legal_evidence = await self.collect_legal_evidence(case_id)
-        government_records = await self.collect_government_records(property_ulpin)
+        blockchain_evidence, satellite_evidence, drone_evidence, legal_evidence, government_records = collected
         
         # Create evidence bundle
         evidence_bundle = EvidenceBundle(
@@ -564,7 +964,7 @@ class EvidenceAggregator:
         
         # Calculate completeness and integrity
         evidence_bundle.completeness_score = self.calculate_completeness_score(evidence_bundle)
-        evidence_bundle.bundle_integrity_hash = self.calculate_bundle_integrity_hash(evidence_bundle)
+        payloads, evidence_bundle.bundle_integrity_hash = self._serialize_and_hash(evidence_bundle)
         
         # Determine confidence rating
         if evidence_bundle.completeness_score >= 80:
@@ -601,31 +1001,63 @@ class EvidenceAggregator:
         }
         
         # Store in database
-        await self._store_evidence_bundle(evidence_bundle)
+        await self._store_evidence_bundle(evidence_bundle, payloads)
         
         logger.info(f"Evidence bundle generated successfully. Completeness: {evidence_bundle.completeness_score}%")
         return evidence_bundle
 
-    async def _store_evidence_bundle(self, evidence_bundle: EvidenceBundle):
+    async def _store_evidence_bundle(self, evidence_bundle: EvidenceBundle,
+                                     payloads: Optional[Dict[str, List[bytes]]] = None):
         """
-        Store evidence bundle in database
+        Store evidence bundle and its sources in a single transaction.
+        Record payloads already serialized for hashing are reused when given.
         """
+        if payloads is None:
+            payloads = self._serialize_and_hash(evidence_bundle)[0]
+        bundle_row = (
+            evidence_bundle.bundle_id,
+            evidence_bundle.case_id,
+            evidence_bundle.property_ulpin,
+            evidence_bundle.creation_timestamp.isoformat(),
+            self._bundle_json(evidence_bundle, payloads),
+            evidence_bundle.completeness_score
+        )
+        
         try:
-            with sqlite3.connect(self.evidence_db_path) as conn:
-                conn.execute('''
-                    INSERT INTO evidence_bundles 
-                    (bundle_id, case_id, property_ulpin, creation_timestamp, bundle_data, completeness_score)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    evidence_bundle.bundle_id,
-                    evidence_bundle.case_id,
-                    evidence_bundle.property_ulpin,
-                    evidence_bundle.creation_timestamp.isoformat(),
-                    json.dumps(asdict(evidence_bundle), default=str),
-                    evidence_bundle.completeness_score
-                ))
+            with self._db() as conn:
+                conn.execute(INSERT_BUNDLE_SQL, bundle_row)
+                conn.executemany(INSERT_SOURCE_SQL, self._evidence_source_rows(evidence_bundle, payloads))
         except Exception as e:
-            logger.error(f"Failed to store evidence bundle: {e}")
+            logger.error(f"Failed to store evidence bundle {evidence_bundle.bundle_id}: {e}")
+            raise
+
+    @staticmethod
+    def _bundle_json(evidence_bundle: EvidenceBundle, payloads: Dict[str, List[bytes]]) -> str:
+        """
+        Bundle JSON with the evidence sections spliced in from their record payloads
+        """
+        header = {name: getattr(evidence_bundle, name) for name in BUNDLE_HEADER_FIELDS}
+        if orjson is not None:
+            encoded_header = orjson.dumps(header, default=_json_default).decode()
+        else:
+            encoded_header = json.dumps(header, ensure_ascii=False, default=_json_default)
+        parts = [encoded_header[:-1]]
+        for source, attribute in EVIDENCE_FIELDS:
+            parts.append(f',"{attribute}":[{b",".join(payloads[source]).decode()}]')
+        parts.append('}')
+        return ''.join(parts)
+
+    def _evidence_source_rows(self, evidence_bundle: EvidenceBundle, payloads: Dict[str, List[bytes]]):
+        """
+        evidence_sources rows for every record of a bundle, in canonical section order
+        """
+        bundle_timestamp = evidence_bundle.creation_timestamp.isoformat()
+        for source, records in self._evidence_sections(evidence_bundle):
+            timestamp_field = EVIDENCE_TIMESTAMP_FIELDS[source]
+            for record, payload in zip(records, payloads[source]):
+                observed = getattr(record, timestamp_field, None)
+                timestamp = observed.isoformat() if isinstance(observed, datetime) else bundle_timestamp
+                yield (evidence_bundle.bundle_id, source, payload.decode(), timestamp)
 
     def generate_pdf_report(self, evidence_bundle: EvidenceBundle, output_path: str = None) -> str:
         """
@@ -637,19 +1069,11 @@ class EvidenceAggregator:
         
         # Create PDF document
         doc = SimpleDocTemplate(output_path, pagesize=A4)
-        styles = getSampleStyleSheet()
+        styles = self._styles
         story = []
         
         # Title page
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        story.append(Paragraph("Gujarat LandChain Evidence Bundle", title_style))
+        story.append(Paragraph("Gujarat LandChain Evidence Bundle", self._title_style))
         story.append(Spacer(1, 12))
         
         # Case information
@@ -664,16 +1088,7 @@ class EvidenceAggregator:
         ]
         
         case_table = Table(case_info, colWidths=[2*inch, 4*inch])
-        case_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        case_table.setStyle(CASE_TABLE_STYLE)
         
         story.append(case_table)
         story.append(PageBreak())
@@ -708,6 +1123,35 @@ class EvidenceAggregator:
         logger.info(f"PDF evidence report generated: {output_path}")
         return output_path
 
+    def _embed_image(self, source, max_width: float = 6 * inch) -> Image:
+        """
+        Downscale an image (file path or raw bytes) to a compact JPEG flowable.
+        Identical sources are encoded once and reused from the image cache.
+        """
+        data = source if isinstance(source, bytes) else Path(source).read_bytes()
+        key = hashlib.sha256(data).hexdigest()
+        
+        if key not in self._image_cache:
+            with PILImage.open(io.BytesIO(data)) as picture:
+                picture.thumbnail((PDF_IMAGE_MAX_PIXELS, PDF_IMAGE_MAX_PIXELS), PILImage.LANCZOS)
+                picture = picture.convert('RGB')
+                buffer = io.BytesIO()
+                picture.save(buffer, format='JPEG', quality=PDF_IMAGE_JPEG_QUALITY, optimize=True)
+                self._image_cache[key] = (buffer.getvalue(), picture.size)
+        
+        encoded, (width, height) = self._image_cache[key]
+        display_width = min(max_width, float(width))
+        return Image(io.BytesIO(encoded), width=display_width, height=display_width * height / width)
+
+    @staticmethod
+    def _records_paragraph(records: Iterable[Iterable[Tuple[str, Any]]], styles) -> Paragraph:
+        """One Paragraph for a list of (label, value) records, so the markup is parsed once per section"""
+        markup = "<br/><br/>".join(
+            "<br/>".join(f"<b>{label}:</b> {escape(str(value))}" for label, value in record)
+            for record in records
+        )
+        return Paragraph(markup, styles['Normal'])
+
     def _add_blockchain_evidence_section(self, story, evidence_list, styles):
         """Add blockchain evidence section to PDF"""
         story.append(Paragraph("Blockchain Evidence", styles['Heading2']))
@@ -718,12 +1162,14 @@ class EvidenceAggregator:
             story.append(Spacer(1, 12))
             return
         
-        for evidence in evidence_list:
-            story.append(Paragraph(f"Transaction: {evidence.transaction_hash}", styles['Heading3']))
-            story.append(Paragraph(f"Event Type: {evidence.event_type}", styles['Normal']))
-            story.append(Paragraph(f"Timestamp: {evidence.timestamp}", styles['Normal']))
-            story.append(Paragraph(f"Block Number: {evidence.block_number}", styles['Normal']))
-            story.append(Spacer(1, 12))
+        story.append(self._records_paragraph((
+            (("Transaction", evidence.transaction_hash),
+             ("Event Type", evidence.event_type),
+             ("Timestamp", evidence.timestamp),
+             ("Block Number", evidence.block_number))
+            for evidence in evidence_list
+        ), styles))
+        story.append(Spacer(1, 12))
 
     def _add_satellite_evidence_section(self, story, evidence_list, styles):
         """Add satellite evidence section to PDF"""
@@ -735,10 +1181,17 @@ class EvidenceAggregator:
             story.append(Spacer(1, 12))
             return
         
+        # Images are interleaved with the records, so this section keeps one Paragraph per record.
+        # Only images already on local disk are embedded; remote URLs are cited, not fetched
         for evidence in evidence_list:
-            story.append(Paragraph(f"Satellite: {evidence.satellite_source}", styles['Heading3']))
-            story.append(Paragraph(f"Capture Date: {evidence.capture_date}", styles['Normal']))
-            story.append(Paragraph(f"Resolution: {evidence.resolution_meters}m", styles['Normal']))
+            story.append(self._records_paragraph([(
+                ("Satellite", evidence.satellite_source),
+                ("Capture Date", evidence.capture_date),
+                ("Resolution", f"{evidence.resolution_meters}m"),
+                ("Image", evidence.image_url)
+            )], styles))
+            if isinstance(evidence.image_url, str) and os.path.isfile(evidence.image_url):
+                story.append(self._embed_image(evidence.image_url))
             story.append(Spacer(1, 12))
 
     def _add_drone_evidence_section(self, story, evidence_list, styles):
@@ -751,11 +1204,13 @@ class EvidenceAggregator:
             story.append(Spacer(1, 12))
             return
         
-        for evidence in evidence_list:
-            story.append(Paragraph(f"Validation ID: {evidence.validation_id}", styles['Heading3']))
-            story.append(Paragraph(f"Result: {evidence.validation_result}", styles['Normal']))
-            story.append(Paragraph(f"Consensus Score: {evidence.consensus_score}", styles['Normal']))
-            story.append(Spacer(1, 12))
+        story.append(self._records_paragraph((
+            (("Validation ID", evidence.validation_id),
+             ("Result", evidence.validation_result),
+             ("Consensus Score", evidence.consensus_score))
+            for evidence in evidence_list
+        ), styles))
+        story.append(Spacer(1, 12))
 
     def _add_legal_evidence_section(self, story, evidence_list, styles):
         """Add legal evidence section to PDF"""
@@ -767,11 +1222,13 @@ class EvidenceAggregator:
             story.append(Spacer(1, 12))
             return
         
-        for evidence in evidence_list:
-            story.append(Paragraph(f"Document: {evidence.original_filename}", styles['Heading3']))
-            story.append(Paragraph(f"Type: {evidence.document_type}", styles['Normal']))
-            story.append(Paragraph(f"Confidence: {evidence.extraction_confidence}%", styles['Normal']))
-            story.append(Spacer(1, 12))
+        story.append(self._records_paragraph((
+            (("Document", evidence.original_filename),
+             ("Type", evidence.document_type),
+             ("Confidence", f"{evidence.extraction_confidence}%"))
+            for evidence in evidence_list
+        ), styles))
+        story.append(Spacer(1, 12))
 
     def _add_government_records_section(self, story, records_list, styles):
         """Add government records section to PDF"""
@@ -783,19 +1240,19 @@ class EvidenceAggregator:
             story.append(Spacer(1, 12))
             return
         
-        for record in records_list:
-            story.append(Paragraph(f"Record: {record.record_number}", styles['Heading3']))
-            story.append(Paragraph(f"Type: {record.record_type}", styles['Normal']))
-            story.append(Paragraph(f"Issuing Office: {record.issuing_office}", styles['Normal']))
-            story.append(Spacer(1, 12))
+        story.append(self._records_paragraph((
+            (("Record", record.record_number),
+             ("Type", record.record_type),
+             ("Issuing Office", record.issuing_office))
+            for record in records_list
+        ), styles))
+        story.append(Spacer(1, 12))
 
 # Demo and Testing Functions
 async def demo_evidence_generation():
     """
     Demo function to test evidence bundle generation
     """
-    aggregator = EvidenceAggregator()
-    
     # Test case data
     test_case = {
         'case_id': 'CASE_2025_001',
@@ -804,15 +1261,16 @@ async def demo_evidence_generation():
     }
     
     try:
-        # Generate evidence bundle
-        evidence_bundle = await aggregator.generate_evidence_bundle(
-            test_case['case_id'],
-            test_case['property_ulpin'],
-            test_case['property_coordinates']
-        )
-        
-        # Generate PDF report
-        pdf_path = aggregator.generate_pdf_report(evidence_bundle)
+        async with EvidenceAggregator() as aggregator:
+            # Generate evidence bundle
+            evidence_bundle = await aggregator.generate_evidence_bundle(
+                test_case['case_id'],
+                test_case['property_ulpin'],
+                test_case['property_coordinates']
+            )
+            
+            # Generate PDF report
+            pdf_path = aggregator.generate_pdf_report(evidence_bundle)
         
         print(f"✅ Evidence bundle generated successfully!")
         print(f"📋 Bundle ID: {evidence_bundle.bundle_id}")
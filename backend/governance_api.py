@@ -7,12 +7,22 @@ Backend API for Governance Voting System
 - Objective: Handle governance votes, case management, role verification
 - Features: Multi-signature voting, audit trails, evidence linking
 - Security: Role-based access, vote immutability, fraud detection
+- Deployment: run under a threaded WSGI server, e.g.
+  gunicorn -k gthread -w 2 --threads 8 governance_api:app
+  (threads rather than gevent: sqlite3 calls block in C and would stall a gevent hub;
+  8 threads matches DB_POOL_SIZE)
 """
 
 from flask import Flask, request, jsonify, g
 from flask_cors import CORS
-from functools import wraps
+from functools import lru_cache, wraps
+import os
 import sqlite3
+import queue
+import threading
+import time
+import itertools
+from collections import OrderedDict
 import json
 import hashlib
 import secrets
@@ -20,6 +30,18 @@ from datetime import datetime, timedelta
 from web3 import Web3
 import logging
 
+# C-accelerated JSON encoding when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_dumps(value):
+    """Encode a value as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(',', ':'))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,6 +53,40 @@ CORS(app)
 DATABASE = 'governance.db'
 SECRET_KEY = secrets.token_hex(32)  # In production, use environment variable
 
+# Audit and vote IDs need to be unique, not unpredictable: a random per-process
+# prefix plus a counter avoids reading the OS CSPRNG for every row. 64 random bits
+# keep prefixes from colliding across restarts over the deployment's life.
+ID_PREFIX_BYTES = 8
+
+def _reseed_ids():
+    """Draw a fresh ID prefix and restart the ID counter for this process."""
+    global ID_PREFIX, _id_counter
+    ID_PREFIX = secrets.token_hex(ID_PREFIX_BYTES)
+    _id_counter = itertools.count()
+
+_reseed_ids()
+# Workers forked after import (gunicorn --preload) would otherwise share the
+# parent's prefix and counter and issue the same IDs
+os.register_at_fork(after_in_child=_reseed_ids)
+
+# Per-connection SQLite tuning. In WAL mode synchronous=NORMAL only fsyncs at
+# checkpoints: commits survive application crashes, though the most recent
+# ones can be lost on power failure.
+CONNECTION_PRAGMAS = (
+    'synchronous=NORMAL',
+    'temp_store=MEMORY',
+    'cache_size=-65536',
+    'mmap_size=268435456'
+)
+
+# journal_mode=WAL is stored in the database file, so it is set once per process
+_wal_enabled = False
+
+# Idle connections kept for reuse by later requests, so connecting and applying
+# PRAGMAs is paid once per pooled connection rather than once per request
+DB_POOL_SIZE = 8
+_db_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
 # Gujarat LandChain governance configuration
 GOVERNANCE_CONFIG = {
     'roles': {
@@ -71,20 +127,123 @@ GOVERNANCE_CONFIG = {
     }
 }
 
+# Permission sets per role, built once for require_role checks
+ROLE_PERMISSIONS = {
+    role: frozenset(config['permissions'])
+    for role, config in GOVERNANCE_CONFIG['roles'].items()
+}
+
+# Approval threshold keyed by the case's priority column value (HIGH, MEDIUM, LOW)
+PRIORITY_THRESHOLDS = {
+    priority.removesuffix('_PRIORITY'): threshold
+    for priority, threshold in GOVERNANCE_CONFIG['vote_thresholds'].items()
+}
+
+# Active officials looked up by wallet address, kept briefly so authentication does
+# not query SQLite on every request. Misses and inactive officials are never cached.
+# The cache is per process: writes here clear it in this worker only, so another
+# gunicorn worker may keep honouring a deactivated official for up to the TTL.
+# That window is accepted in exchange for the saved lookups.
+OFFICIAL_CACHE_SIZE = 1024
+OFFICIAL_CACHE_TTL_SECONDS = 5
+_official_cache = OrderedDict()
+_official_cache_lock = threading.Lock()
+
+# Notification payloads per role, reused for a few seconds by polling clients
+NOTIFICATION_CACHE_TTL_SECONDS = 5
+_notification_cache = {}
+
+# Hot-path SQL, kept as constants so every call passes the identical string
+# and hits the connection's prepared-statement cache
+GET_OFFICIAL_SQL = "SELECT name, role, district, verified FROM officials WHERE wallet_address = ? AND status = 'ACTIVE'"
+
+GET_CASES_SQL = '''
+    SELECT cases.*, COUNT(votes.id) AS vote_count
+    FROM case_assignments
+    JOIN cases ON cases.id = case_assignments.case_id
+    LEFT JOIN votes ON votes.case_id = cases.id
+    WHERE case_assignments.role = ?
+    GROUP BY case_assignments.case_id
+    ORDER BY 
+        CASE cases.priority 
+            WHEN 'HIGH' THEN 1 
+            WHEN 'MEDIUM' THEN 2 
+            WHEN 'LOW' THEN 3 
+        END,
+        cases.created_date DESC
+'''
+
+GET_CASE_FOR_VOTER_SQL = '''
+    SELECT cases.*, EXISTS (
+        SELECT 1 FROM votes WHERE votes.case_id = cases.id AND votes.voter_address = ?
+    ) AS already_voted
+    FROM cases 
+    WHERE cases.id = ?
+'''
+
+INSERT_VOTE_SQL = '''
+    INSERT INTO votes 
+    (id, case_id, voter_role, voter_address, vote_type, reasoning, 
+     timestamp, evidence_bundle_hash, weight)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+TALLY_VOTES_SQL = '''
+    SELECT COUNT(*),
+           COALESCE(SUM(weight), 0),
+           COALESCE(SUM(CASE WHEN vote_type = 'APPROVE' THEN weight ELSE 0 END), 0)
+    FROM votes 
+    WHERE case_id = ?
+'''
+
+INSERT_AUDIT_SQL = '''
+    INSERT INTO audit_trail 
+    (id, case_id, action, actor_address, actor_role, timestamp, details, ip_address)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
 # Database helper functions
+def _connect_db():
+    """Open and configure a new database connection."""
+    global _wal_enabled
+    # Pooled connections move between request threads, but only one request
+    # uses a connection at a time
+    db = sqlite3.connect(DATABASE, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+    db.row_factory = sqlite3.Row
+    if not _wal_enabled:
+        db.execute('PRAGMA journal_mode=WAL')
+        _wal_enabled = True
+    for pragma in CONNECTION_PRAGMAS:
+        db.execute(f'PRAGMA {pragma}')
+    return db
+
 def get_db():
     """Get database connection."""
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row
+        try:
+            db = _db_pool.get_nowait()
+        except queue.Empty:
+            db = _connect_db()
+        g._database = db
     return db
 
 @app.teardown_appcontext
 def close_db(exception):
-    """Close database connection."""
-    db = getattr(g, '_database', None)
-    if db is not None:
+    """Return database connection to the pool."""
+    db = g.pop('_database', None)
+    if db is None:
+        return
+    
+    # Never hand an open transaction to the next request
+    if db.in_transaction:
+        db.rollback()
+    try:
+        _db_pool.put_nowait(db)
+    except queue.Full:
         db.close()
 
 def init_db():
@@ -110,6 +269,24 @@ def init_db():
             )
         ''')
         
+        # Case assignments (one row per assigned role; cases.assigned_officials
+        # keeps the same list as JSON for display)
+        db.execute('''
+            CREATE TABLE IF NOT EXISTS case_assignments (
+                case_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                PRIMARY KEY (role, case_id),
+                FOREIGN KEY (case_id) REFERENCES cases (id)
+            )
+        ''')
+        
+        # Backfill assignments for cases created before the table existed
+        db.execute('''
+            INSERT OR IGNORE INTO case_assignments (case_id, role)
+            SELECT cases.id, json_each.value
+            FROM cases, json_each(cases.assigned_officials)
+        ''')
+        
         # Votes table
         db.execute('''
             CREATE TABLE IF NOT EXISTS votes (
@@ -169,8 +346,61 @@ def init_db():
             )
         ''')
         
+        # Indexes for the per-case lookups; (case_id, voter_address) also serves
+        # queries on case_id alone
+        db.execute('CREATE INDEX IF NOT EXISTS idx_votes_case_voter ON votes (case_id, voter_address)')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_audit_case_timestamp ON audit_trail (case_id, timestamp DESC)')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_evidence_links_case ON evidence_links (case_id)')
+        
         db.commit()
 
+def _lookup_official(wallet_address):
+    """Get the active official for a wallet address as a dict, or None."""
+    now = time.monotonic()
+    with _official_cache_lock:
+        cached = _official_cache.get(wallet_address)
+        if cached is not None and cached[0] > now:
+            _official_cache.move_to_end(wallet_address)
+            return cached[1]
+    
+    row = get_db().execute(GET_OFFICIAL_SQL, (wallet_address,)).fetchone()
+    if row is None:
+        # Unknown or deactivated; not cached, so a newly registered official works at once
+        return None
+    official = dict(row)
+    
+    with _official_cache_lock:
+        _official_cache[wallet_address] = (now + OFFICIAL_CACHE_TTL_SECONDS, official)
+        _official_cache.move_to_end(wallet_address)
+        if len(_official_cache) > OFFICIAL_CACHE_SIZE:
+            _official_cache.popitem(last=False)
+    return official
+
+def _invalidate_officials():
+    """Drop cached official lookups after officials change."""
+    with _official_cache_lock:
+        _official_cache.clear()
+
+def _now_iso():
+    """Current UTC time as ISO text, formatted once per request."""
+    # Shared by everything one request records (a vote and its audit entry get
+    # the same time) while keeping full precision for ordering across requests
+    now = g.get('_now_iso')
+    if now is None:
+        now = g._now_iso = datetime.utcnow().isoformat()
+    return now
+
+@lru_cache(maxsize=1024)
+def _parse_assigned_officials(raw_json):
+    """Parse a case's assigned_officials JSON, memoized by the raw string."""
+    # A tuple so the cached value cannot be mutated by callers
+    return tuple(json.loads(raw_json))
+
+@lru_cache(maxsize=4096)
+def _bundle_hash(bundle_id):
+    """SHA-256 hex digest identifying an evidence bundle, memoized by bundle ID."""
+    return hashlib.sha256(bundle_id.encode()).hexdigest()
+
 # Authentication and authorization decorators
 def require_auth(f):
     """Require wallet authentication."""
@@ -187,11 +417,7 @@ def require_auth(f):
             return jsonify({'error': 'Invalid wallet address'}), 401
         
         # Get user role from database
-        db = get_db()
-        official = db.execute(
-            'SELECT * FROM officials WHERE wallet_address = ? AND status = "ACTIVE"',
-            (wallet_address,)
-        ).fetchone()
+        official = _lookup_official(wallet_address)
         
         if not official:
             return jsonify({'error': 'Unauthorized wallet address'}), 403
@@ -209,16 +435,17 @@ def require_auth(f):
 
 def require_role(required_permissions):
     """Require specific role permissions."""
+    required = frozenset(required_permissions)
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if not hasattr(g, 'current_user'):
                 return jsonify({'error': 'Authentication required'}), 401
             
-            user_role = g.current_user['role']
-            user_permissions = GOVERNANCE_CONFIG['roles'].get(user_role, {}).get('permissions', [])
+            user_permissions = ROLE_PERMISSIONS.get(g.current_user['role'], frozenset())
             
-            if not any(perm in user_permissions for perm in required_permissions):
+            if user_permissions.isdisjoint(required):
                 return jsonify({'error': 'Insufficient permissions'}), 403
             
             return f(*args, **kwargs)
@@ -226,27 +453,30 @@ def require_role(required_permissions):
     return decorator
 
 def log_action(case_id, action, details=None):
-    """Log action to audit trail."""
+    """Log action to audit trail (written by the request's _commit_with_audit)."""
     if not hasattr(g, 'current_user'):
         return
     
-    db = get_db()
-    audit_id = f"audit_{secrets.token_hex(8)}"
+    audit_id = f"audit_{ID_PREFIX}_{next(_id_counter)}"
     
-    db.execute('''
-        INSERT INTO audit_trail 
-        (id, case_id, action, actor_address, actor_role, timestamp, details, ip_address)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+    g.setdefault('_audit_buffer', []).append((
         audit_id,
         case_id,
         action,
         g.current_user['wallet_address'],
         g.current_user['role'],
-        datetime.utcnow().isoformat(),
-        json.dumps(details) if details else None,
+        _now_iso(),
+        json_dumps(details) if details else None,
         request.remote_addr
     ))
+
+def _commit_with_audit(db):
+    """Commit the request's writes together with its queued audit entries."""
+    # Same transaction as the endpoint's own writes, so an action is never
+    # reported as done while its audit entry fails to be stored
+    audit_buffer = g.pop('_audit_buffer', None)
+    if audit_buffer:
+        db.executemany(INSERT_AUDIT_SQL, audit_buffer)
     db.commit()
 
 # API Endpoints
@@ -259,29 +489,16 @@ def get_cases():
         db = get_db()
         user_role = g.current_user['role']
         
-        # Get cases where user role is assigned
-        cases = db.execute('''
-            SELECT * FROM cases 
-            WHERE assigned_officials LIKE ? 
-            ORDER BY 
-                CASE priority 
-                    WHEN 'HIGH' THEN 1 
-                    WHEN 'MEDIUM' THEN 2 
-                    WHEN 'LOW' THEN 3 
-                END,
-                created_date DESC
-        ''', (f'%{user_role}%',)).fetchall()
+        # Get cases where user role is assigned, with their vote counts
+        # aggregated in the same query rather than one COUNT per case. Grouping
+        # on the assignment key follows the (role, case_id) index order, so
+        # SQLite only needs a sort for the final ORDER BY.
+        cases = db.execute(GET_CASES_SQL, (user_role,)).fetchall()
         
         result = []
         for case in cases:
-            # Get vote count for this case
-            vote_count = db.execute(
-                'SELECT COUNT(*) as count FROM votes WHERE case_id = ?',
-                (case['id'],)
-            ).fetchone()['count']
-            
             # Calculate required votes based on assigned officials
-            assigned_officials = json.loads(case['assigned_officials'])
+            assigned_officials = _parse_assigned_officials(case['assigned_officials'])
             total_required_votes = len(assigned_officials)
             
             case_data = {
@@ -293,7 +510,7 @@ def get_cases():
                 'created_date': case['created_date'],
                 'assigned_officials': assigned_officials,
                 'evidence_completeness': case['evidence_completeness'],
-                'votes_cast': vote_count,
+                'votes_cast': case['vote_count'],
                 'total_required_votes': total_required_votes,
                 'estimated_resolution': case['estimated_resolution']
             }
@@ -321,7 +538,7 @@ def get_case_evidence(case_id):
         if not case:
             return jsonify({'error': 'Case not found'}), 404
         
-        assigned_officials = json.loads(case['assigned_officials'])
+        assigned_officials = _parse_assigned_officials(case['assigned_officials'])
         if g.current_user['role'] not in assigned_officials:
             return jsonify({'error': 'Access denied to this case'}), 403
         
@@ -361,6 +578,7 @@ def get_case_evidence(case_id):
         }
         
         log_action(case_id, 'EVIDENCE_VIEWED')
+        _commit_with_audit(db)
         
         return jsonify({'evidence_bundle': evidence_bundle})
         
@@ -388,60 +606,44 @@ def cast_vote(case_id):
         
         db = get_db()
         
-        # Verify case exists and user has access
-        case = db.execute('SELECT * FROM cases WHERE id = ?', (case_id,)).fetchone()
+        # Verify case exists and user has access, checking for an existing
+        # vote by this user in the same query
+        case = db.execute(GET_CASE_FOR_VOTER_SQL, (g.current_user['wallet_address'], case_id)).fetchone()
         if not case:
             return jsonify({'error': 'Case not found'}), 404
         
-        assigned_officials = json.loads(case['assigned_officials'])
+        assigned_officials = _parse_assigned_officials(case['assigned_officials'])
         if g.current_user['role'] not in assigned_officials:
             return jsonify({'error': 'Access denied to this case'}), 403
         
-        # Check if user has already voted
-        existing_vote = db.execute(
-            'SELECT * FROM votes WHERE case_id = ? AND voter_address = ?',
-            (case_id, g.current_user['wallet_address'])
-        ).fetchone()
-        
-        if existing_vote:
+        if case['already_voted']:
             return jsonify({'error': 'You have already voted on this case'}), 400
         
         # Generate vote ID and record vote
-        vote_id = f"vote_{secrets.token_hex(8)}"
+        vote_id = f"vote_{ID_PREFIX}_{next(_id_counter)}"
         vote_weight = GOVERNANCE_CONFIG['roles'][g.current_user['role']]['voting_weight']
         
-        db.execute('''
-            INSERT INTO votes 
-            (id, case_id, voter_role, voter_address, vote_type, reasoning, 
-             timestamp, evidence_bundle_hash, weight)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        db.execute(INSERT_VOTE_SQL, (
             vote_id,
             case_id,
             g.current_user['role'],
             g.current_user['wallet_address'],
             vote_type,
             reasoning,
-            datetime.utcnow().isoformat(),
+            _now_iso(),
             evidence_bundle_hash,
             vote_weight
         ))
         
-        # Check if voting threshold is reached
-        votes = db.execute(
-            'SELECT vote_type, weight FROM votes WHERE case_id = ?',
-            (case_id,)
-        ).fetchall()
-        
-        total_weight = sum(vote['weight'] for vote in votes)
-        approve_weight = sum(vote['weight'] for vote in votes if vote['vote_type'] == 'APPROVE')
+        # Check if voting threshold is reached (aggregated in SQLite)
+        vote_count, total_weight, approve_weight = db.execute(TALLY_VOTES_SQL, (case_id,)).fetchone()
         
-        threshold = GOVERNANCE_CONFIG['vote_thresholds'][case['priority'] + '_PRIORITY']
+        threshold = PRIORITY_THRESHOLDS[case['priority']]
         approval_percentage = (approve_weight / total_weight * 100) if total_weight > 0 else 0
         
         # Update case status if threshold reached
         new_status = case['status']
-        if len(votes) >= len(assigned_officials):  # All officials have voted
+        if vote_count >= len(assigned_officials):  # All officials have voted
             if approval_percentage >= threshold:
                 new_status = 'CONSENSUS_REACHED'
             else:
@@ -453,8 +655,6 @@ def cast_vote(case_id):
                 (new_status, case_id)
             )
         
-        db.commit()
-        
         # Log the vote action
         log_action(case_id, 'VOTE_CAST', {
             'vote_type': vote_type,
@@ -462,6 +662,8 @@ def cast_vote(case_id):
             'approval_percentage': approval_percentage
         })
         
+        _commit_with_audit(db)
+        
         return jsonify({
             'message': 'Vote cast successfully',
             'vote_id': vote_id,
@@ -485,63 +687,81 @@ def get_case_votes(case_id):
         if not case:
             return jsonify({'error': 'Case not found'}), 404
         
-        assigned_officials = json.loads(case['assigned_officials'])
+        assigned_officials = _parse_assigned_officials(case['assigned_officials'])
         if g.current_user['role'] not in assigned_officials:
             return jsonify({'error': 'Access denied to this case'}), 403
         
-        # Get all votes for the case
+        # Optional pagination of the vote list (LIMIT -1 means no limit)
+        limit = request.args.get('limit', -1, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        
         votes = db.execute('''
             SELECT voter_role, vote_type, reasoning, timestamp, weight
             FROM votes 
             WHERE case_id = ? 
             ORDER BY timestamp ASC
+            LIMIT ? OFFSET ?
+        ''', (case_id, limit, offset)).fetchall()
+        
+        # Calculate vote breakdown over all votes, independent of the page
+        breakdown = db.execute('''
+            SELECT vote_type, COUNT(*) AS count, SUM(weight) AS weight
+            FROM votes 
+            WHERE case_id = ? 
+            GROUP BY vote_type
         ''', (case_id,)).fetchall()
         
         vote_summary = {
-            'total_votes': len(votes),
-            'vote_breakdown': {},
+            'total_votes': sum(row['count'] for row in breakdown),
+            'vote_breakdown': {
+                row['vote_type']: {'count': row['count'], 'weight': row['weight']}
+                for row in breakdown
+            },
             'votes': [dict(vote) for vote in votes]
         }
         
-        # Calculate vote breakdown
-        for vote in votes:
-            vote_type = vote['vote_type']
-            if vote_type not in vote_summary['vote_breakdown']:
-                vote_summary['vote_breakdown'][vote_type] = {'count': 0, 'weight': 0}
-            vote_summary['vote_breakdown'][vote_type]['count'] += 1
-            vote_summary['vote_breakdown'][vote_type]['weight'] += vote['weight']
-        
         return jsonify(vote_summary)
         
     except Exception as e:
         logger.error(f"Error fetching votes: {str(e)}")
         return jsonify({'error': 'Failed to fetch votes'}), 500
 
+def _notifications_for(user_role):
+    """Build (or reuse) the notification list for a role."""
+    now_monotonic = time.monotonic()
+    cached = _notification_cache.get(user_role)
+    if cached is not None and cached[0] > now_monotonic:
+        return cached[1]
+    
+    now = datetime.utcnow()
+    
+    # Mock notifications (in real implementation, generate based on case activity)
+    notifications = [
+        {
+            'id': 'notif_1',
+            'type': 'NEW_CASE',
+            'message': f'New case assigned requiring {user_role} review',
+            'timestamp': now.isoformat(),
+            'read': False
+        },
+        {
+            'id': 'notif_2',
+            'type': 'VOTE_REQUIRED',
+            'message': 'Your vote is required for pending case',
+            'timestamp': (now - timedelta(hours=2)).isoformat(),
+            'read': False
+        }
+    ]
+    
+    _notification_cache[user_role] = (now_monotonic + NOTIFICATION_CACHE_TTL_SECONDS, notifications)
+    return notifications
+
 @app.route('/api/governance/notifications', methods=['GET'])
 @require_auth
 def get_notifications():
     """Get notifications for current user."""
     try:
-        db = get_db()
-        user_role = g.current_user['role']
-        
-        # Mock notifications (in real implementation, generate based on case activity)
-        notifications = [
-            {
-                'id': 'notif_1',
-                'type': 'NEW_CASE',
-                'message': f'New case assigned requiring {user_role} review',
-                'timestamp': datetime.utcnow().isoformat(),
-                'read': False
-            },
-            {
-                'id': 'notif_2',
-                'type': 'VOTE_REQUIRED',
-                'message': 'Your vote is required for pending case',
-                'timestamp': (datetime.utcnow() - timedelta(hours=2)).isoformat(),
-                'read': False
-            }
-        ]
+        notifications = _notifications_for(g.current_user['role'])
         
         return jsonify({'notifications': notifications})
         
@@ -604,20 +824,24 @@ def init_sample_data():
             }
         ]
         
-        for official in sample_officials:
-            db.execute('''
-                INSERT OR REPLACE INTO officials 
-                (wallet_address, name, role, district, verified, verification_date, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        verification_date = _now_iso()
+        db.executemany('''
+            INSERT OR REPLACE INTO officials 
+            (wallet_address, name, role, district, verified, verification_date, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
                 official['wallet_address'],
                 official['name'],
                 official['role'],
                 official['district'],
                 official['verified'],
-                datetime.utcnow().isoformat(),
+                verification_date,
                 'ACTIVE'
-            ))
+            )
+            for official in sample_officials
+        ])
+        _invalidate_officials()
         
         # Sample cases
         sample_cases = [
@@ -633,43 +857,60 @@ def init_sample_data():
             }
         ]
         
-        for case in sample_cases:
-            db.execute('''
-                INSERT OR REPLACE INTO cases 
-                (id, title, property_ulpin, status, priority, created_date, 
-                 assigned_officials, evidence_completeness, created_by)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        db.executemany('''
+            INSERT OR REPLACE INTO cases 
+            (id, title, property_ulpin, status, priority, created_date, 
+             assigned_officials, evidence_completeness, created_by)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
                 case['id'],
                 case['title'],
                 case['property_ulpin'],
                 case['status'],
                 case['priority'],
                 case['created_date'],
-                json.dumps(case['assigned_officials']),
+                json_dumps(case['assigned_officials']),
                 case['evidence_completeness'],
                 'system'
-            ))
-            
-            # Link evidence bundle
-            db.execute('''
-                INSERT OR REPLACE INTO evidence_links
-                (id, case_id, bundle_id, bundle_hash, completeness_score, 
-                 confidence_rating, generated_timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            )
+            for case in sample_cases
+        ])
+        
+        db.executemany(
+            'INSERT OR IGNORE INTO case_assignments (case_id, role) VALUES (?, ?)',
+            [(case['id'], role) for case in sample_cases for role in case['assigned_officials']]
+        )
+        
+        # Link evidence bundles
+        generated_timestamp = _now_iso()
+        db.executemany('''
+            INSERT OR REPLACE INTO evidence_links
+            (id, case_id, bundle_id, bundle_hash, completeness_score, 
+             confidence_rating, generated_timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
                 f"evidence_{case['id']}",
                 case['id'],
                 f"bundle_{case['id']}",
-                hashlib.sha256(f"bundle_{case['id']}".encode()).hexdigest(),
+                _bundle_hash(f"bundle_{case['id']}"),
                 case['evidence_completeness'],
                 'HIGH',
-                datetime.utcnow().isoformat()
-            ))
+                generated_timestamp
+            )
+            for case in sample_cases
+        ])
         
         db.commit()
 
 if __name__ == '__main__':
     init_db()
     init_sample_data()
-    app.run(debug=True, host='0.0.0.0', port=5003)
+    # Development server only; the debugger is opt-in via FLASK_DEBUG=1
+    app.run(
+        debug=os.getenv('FLASK_DEBUG') == '1',
+        host='0.0.0.0',
+        port=5003,
+        threaded=True
+    )
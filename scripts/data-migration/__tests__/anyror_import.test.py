@@ -0,0 +1,161 @@
+# AnyROR Import Tests
+# Gujarat LandChain × Data Migration Testing Suite
+
+"""
+Unit tests for the AnyROR importer's staging encoders
+- Objective: Test binary COPY encoding, COPY stream framing and PyArrow parsing
+- Coverage: encode_binary_row, _CopyStream, validate_record and its PyArrow equivalent
+"""
+
+import importlib.util
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+
+# The script name contains a hyphen, so load it by path
+_SPEC = importlib.util.spec_from_file_location(
+    "anyror_import", Path(__file__).resolve().parent.parent / "anyror-import.py"
+)
+anyror_import = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(anyror_import)
+
+AnyRORImporter = anyror_import.AnyRORImporter
+LAND_PARCEL_COLUMNS = anyror_import.LAND_PARCEL_COLUMNS
+BINARY_COPY_HEADER = anyror_import.BINARY_COPY_HEADER
+BINARY_COPY_TRAILER = anyror_import.BINARY_COPY_TRAILER
+
+VALID_RECORD = {
+    'ulpin_id': 'a' * 64,
+    'village_name': 'Sanand',
+    'survey_number': '123/4',
+    'land_area': '2.50',
+    'owner_name': 'Ramesh Patel',
+    'owner_aadhaar': '123456789012'
+}
+
+def decode_binary_row(data):
+    """Split one binary COPY tuple into its raw field values (None for NULL)"""
+    (field_count,) = struct.unpack_from('!h', data, 0)
+    offset = 2
+    values = []
+    for _ in range(field_count):
+        (length,) = struct.unpack_from('!i', data, offset)
+        offset += 4
+        if length < 0:
+            values.append(None)
+            continue
+        values.append(data[offset:offset + length])
+        offset += length
+    return values, offset
+
+class TestBinaryCopyEncoding(unittest.TestCase):
+    """Test suite for binary COPY rows and stream framing"""
+
+    def test_encode_binary_row(self):
+        """Test field types, NULLs and field count of an encoded row"""
+        importer = AnyRORImporter({})
+        row = importer.prepare_record({**VALID_RECORD, 'mutation_date': '2000-01-31', 'land_type': ''})
+
+        values, _ = decode_binary_row(anyror_import.encode_binary_row(7, row))
+
+        self.assertEqual(len(values), len(LAND_PARCEL_COLUMNS) + 1)
+        self.assertEqual(struct.unpack('!i', values[0])[0], 7)
+        fields = dict(zip(LAND_PARCEL_COLUMNS, values[1:]))
+        self.assertEqual(fields['ulpin_id'], b'a' * 64)
+        self.assertEqual(struct.unpack('!d', fields['land_area'])[0], 2.5)
+        self.assertEqual(struct.unpack('!i', fields['mutation_date'])[0], 30)  # days since 2000-01-01
+        self.assertIsNone(fields['land_type'])  # empty string loads as NULL
+        self.assertIsNone(fields['nft_mint_address'])
+
+    def test_copy_stream_framing(self):
+        """Test each chunk carries exactly one header and trailer around its rows"""
+        blocks = iter([(1, b'row1'), (2, b'row2row3'), (1, b'row4')])
+        header, trailer = BINARY_COPY_HEADER, BINARY_COPY_TRAILER
+
+        chunks = []
+        while True:
+            stream = anyror_import._CopyStream(blocks, 8, header, trailer)
+            if stream.exhausted:
+                break
+            data = b''.join(iter(lambda: stream.read(3), b''))
+            chunks.append((stream.rows, data))
+
+        self.assertEqual(chunks, [
+            (3, header + b'row1row2row3' + trailer),
+            (1, header + b'row4' + trailer)
+        ])
+
+    def test_copy_stream_discard_pending(self):
+        """Test a pre-fetched block that COPY never read is reported as dropped"""
+        stream = anyror_import._CopyStream(iter([(5, b'rows')]), 1 << 20)
+
+        self.assertFalse(stream.exhausted)
+        self.assertEqual(stream.discard_pending(), 5)
+        self.assertEqual(stream.discard_pending(), 0)
+
+class TestRecordValidation(unittest.TestCase):
+    """Test suite for record validation ahead of COPY"""
+
+    def test_validate_record_limits(self):
+        """Test oversized values are rejected before they reach COPY"""
+        importer = AnyRORImporter({})
+
+        self.assertEqual(importer.validate_record(VALID_RECORD), (True, []))
+        self.assertFalse(importer.validate_record({**VALID_RECORD, 'village_name': 'v' * 256})[0])
+        self.assertFalse(importer.validate_record({**VALID_RECORD, 'land_area': '100000000'})[0])
+        self.assertFalse(importer.validate_record({**VALID_RECORD, 'land_area': 'inf'})[0])
+
+@unittest.skipIf(anyror_import.pa is None, "PyArrow not installed")
+class TestArrowParsing(unittest.TestCase):
+    """Test suite for the PyArrow parsing and validation path"""
+
+    RECORDS = [
+        VALID_RECORD,
+        {**VALID_RECORD, 'owner_aadhaar': ''},
+        {**VALID_RECORD, 'owner_aadhaar': '12345'},
+        {**VALID_RECORD, 'ulpin_id': 'a' * 63},
+        {**VALID_RECORD, 'village_name': '   '},
+        {**VALID_RECORD, 'village_name': 'v' * 256},
+        {**VALID_RECORD, 'nft_mint_address': 'n' * 45},
+        {**VALID_RECORD, 'land_area': '0'},
+        {**VALID_RECORD, 'land_area': '-1.5'},
+        {**VALID_RECORD, 'land_area': 'abc'},
+        {**VALID_RECORD, 'land_area': '1e9'},
+        {**VALID_RECORD, 'land_area': '99999999.99'},
+        {key: value for key, value in VALID_RECORD.items() if key != 'owner_name'}
+    ]
+
+    def test_arrow_valid_mask_matches_validate_record(self):
+        """Test the vectorised mask accepts exactly the rows validate_record does"""
+        pa = anyror_import.pa
+        importer = AnyRORImporter({})
+        table = pa.table({
+            column: pa.array([record.get(column) for record in self.RECORDS], pa.string())
+            for column in LAND_PARCEL_COLUMNS
+        })
+
+        expected = [importer.validate_record(dict(record))[0] for record in self.RECORDS]
+        self.assertEqual(importer._arrow_valid_mask(table).to_pylist(), expected)
+
+    def test_arrow_reader_skips_malformed_rows(self):
+        """Test quoted newlines parse and a row with extra fields fails on its own"""
+        ulpin = 'a' * 64
+        importer = AnyRORImporter({}, writers=1)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as csvfile:
+            csvfile.write(
+                "ulpin_id,village_name,survey_number,land_area,owner_name\n"
+                f'{ulpin},"Sanand\nTaluka",1,2.5,Ramesh Patel\n'
+                f"{'b' * 64},Sanand,1,2.5,Ramesh Patel,EXTRA\n"
+            )
+        blocks = list(importer.encode_arrow_batches(csvfile.name))
+        Path(csvfile.name).unlink()
+
+        self.assertEqual(sum(rows for _, rows, _ in blocks), 1)
+        self.assertIn(b'"Sanand\nTaluka"', blocks[0][2])
+        self.assertEqual(importer.stats['total_records'], 2)
+        self.assertEqual(importer.stats['failed_records'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
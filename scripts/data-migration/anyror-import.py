@@ -7,21 +7,37 @@ This script imports AnyROR (Any Record of Rights) CSV data into the PostgreSQL d
 for the Gujarat LandChain pilot program.
 
 Usage:
-    python anyror-import.py --input data/anyror-sample.csv --batch-size 100
+    python anyror-import.py --input data/anyror-sample.csv --chunk-mb 64
 """
 
 import argparse
 import csv
 import hashlib
+import io
 import logging
+import os
+import queue
+import re
+import struct
 import sys
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
+
+# C CSV parsing and columnar validation when PyArrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pc = pacsv = None
 
 # Configure logging
 logging.basicConfig(
@@ -34,12 +50,199 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column order shared by the staging COPY and the land_parcels upsert
+LAND_PARCEL_COLUMNS = (
+    'ulpin_id', 'village_name', 'survey_number', 'land_area', 'land_type',
+    'owner_name', 'owner_aadhaar', 'ownership_type', 'mutation_date',
+    'registration_number', 'document_type', 'encumbrance_status',
+    'verification_status', 'nft_mint_address', 'freeze_status'
+)
+
+# Fields that must be present and non-blank on every AnyROR record
+REQUIRED_FIELDS = ('ulpin_id', 'village_name', 'survey_number', 'land_area', 'owner_name')
+
+# Values the staging merge substitutes when a column is absent or empty
+COLUMN_DEFAULTS = {
+    'land_type': 'Agricultural',
+    'ownership_type': 'Individual',
+    'encumbrance_status': 'CLEAR',
+    'verification_status': 'PENDING',
+    'freeze_status': 'UNFROZEN'
+}
+
+# Patterns for the PyArrow validation path; the land area one accepts a subset of
+# what float() does, and rows it rejects fall back to validate_record
+LAND_AREA_PATTERN = r'^-?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$'
+AADHAAR_PATTERN = r'^\d{12}$'
+
+# Compiled once for validate_record; ASCII digits only, matching RE2 on the Arrow path
+AADHAAR_RE = re.compile(AADHAAR_PATTERN, re.ASCII)
+
+# VARCHAR limits of land_parcels, checked up front so one oversized value
+# is rejected on its own instead of failing the COPY of its whole chunk
+COLUMN_MAX_LENGTHS = {
+    'village_name': 255,
+    'survey_number': 50,
+    'land_type': 100,
+    'owner_name': 255,
+    'ownership_type': 50,
+    'registration_number': 100,
+    'document_type': 100,
+    'encumbrance_status': 50,
+    'verification_status': 50,
+    'nft_mint_address': 44,
+    'freeze_status': 50
+}
+
+# Largest land area DECIMAL(10,2) stores without overflowing after rounding
+MAX_LAND_AREA = 99999999.99
+
+# Bytes PyArrow parses per RecordBatch
+ARROW_BLOCK_SIZE = 8 << 20
+
+# Encoded CSV bytes sent through a single COPY before the staged rows are merged;
+# a chunk commits or fails as a unit, so this also bounds how many rows one error rejects
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Encoded bytes handed from the parsing thread to the COPY thread per queue item
+PIPELINE_BLOCK_BYTES = 1 << 20
+
+# Blocks the parser may run ahead of each COPY writer before it waits
+PIPELINE_QUEUE_SIZE = 8
+
+# Distinct mutation dates memoised by parse_mutation_date
+DATE_CACHE_SIZE = 65536
+
+# Read size for the input checksum when hashlib.file_digest is unavailable (< 3.11)
+CHECKSUM_CHUNK_BYTES = 1 << 20
+
+# Secondary indexes dropped for --initial-load and rebuilt once the data is in
+BULK_LOAD_INDEXES = {
+    'idx_land_parcels_village': 'land_parcels(village_name)',
+    'idx_land_parcels_owner': 'land_parcels(owner_name)'
+}
+
+# BULK_LOAD_INDEXES left INVALID by an interrupted CREATE INDEX CONCURRENTLY,
+# which IF NOT EXISTS would otherwise skip forever
+INVALID_INDEXES_SQL = """
+SELECT c.relname FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+WHERE NOT i.indisvalid AND c.relname = ANY(%s)
+"""
+
+# Concurrent COPY writers, each with its own connection and ULPIN partition
+COPY_WRITERS = min(8, os.cpu_count() or 1)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_mutation_date(value: str) -> Optional[date]:
+    """Parse a YYYY-MM-DD mutation date, returning None when it is malformed."""
+    # Canonical dates are sliced directly; anything else keeps strptime's leniency
+    if len(value) == 10 and value[4] == '-' and value[7] == '-' and value[:4].isdigit() \
+            and value[5:7].isdigit() and value[8:].isdigit():
+        try:
+            return date(int(value[:4]), int(value[5:7]), int(value[8:]))
+        except ValueError:
+            return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+# Binary COPY framing: signature, flags and header-extension length, then a -1 field count
+BINARY_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+BINARY_COPY_TRAILER = struct.pack('!h', -1)
+
+# Binary COPY field encoders, built once; a field is its int32 length then its bytes
+_ROW_HEADER = struct.pack('!h', len(LAND_PARCEL_COLUMNS) + 1)
+_INT4_FIELD = struct.Struct('!ii')
+_FLOAT8_FIELD = struct.Struct('!id')
+_FIELD_LENGTH = struct.Struct('!i')
+_NULL_FIELD = _FIELD_LENGTH.pack(-1)
+_PG_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+_LAND_AREA_INDEX = LAND_PARCEL_COLUMNS.index('land_area')
+_MUTATION_DATE_INDEX = LAND_PARCEL_COLUMNS.index('mutation_date')
+
+def encode_binary_row(row_order: int, row: List) -> bytes:
+    """Encode a prepared row (LAND_PARCEL_COLUMNS order) as one binary COPY tuple."""
+    parts = [_ROW_HEADER, _INT4_FIELD.pack(4, row_order)]
+    for index, value in enumerate(row):
+        # Empty strings load as NULL, as they do through CSV COPY
+        if value is None or value == '':
+            parts.append(_NULL_FIELD)
+        elif index == _LAND_AREA_INDEX:
+            parts.append(_FLOAT8_FIELD.pack(8, value))
+        elif index == _MUTATION_DATE_INDEX:
+            parts.append(_INT4_FIELD.pack(4, value.toordinal() - _PG_EPOCH_ORDINAL))
+        else:
+            encoded = value.encode('utf-8')
+            parts.append(_FIELD_LENGTH.pack(len(encoded)))
+            parts.append(encoded)
+    return b''.join(parts)
+
+class _LineSink:
+    """Write target for csv.writer that keeps only the last encoded line."""
+    
+    __slots__ = ('line',)
+    
+    def write(self, line: str) -> None:
+        self.line = line
+
+class _CopyStream:
+    """File-like reader that feeds encoded row blocks to COPY until a byte budget is spent.
+    
+    ``lines`` yields ``(row_count, data)`` pairs so a block can hold one row or a whole batch.
+    ``header`` and ``trailer`` frame the stream for binary COPY.
+    """
+    
+    def __init__(self, lines: Iterator[Tuple[int, bytes]], max_bytes: int,
+                 header: bytes = b'', trailer: bytes = b''):
+        self.lines = lines
+        self.max_bytes = max_bytes
+        self._header = header
+        self._trailer = trailer
+        self.bytes_read = 0
+        self.rows = 0
+        # Pull one line up front so callers can skip empty chunks without a COPY
+        self._pending = next(lines, None)
+        self.exhausted = self._pending is None
+    
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.max_bytes
+        chunks = [self._header]
+        length = len(self._header)
+        self._header = b''
+        while length < size and self.bytes_read < self.max_bytes:
+            block = self._pending if self._pending is not None else next(self.lines, None)
+            self._pending = None
+            if block is None:
+                self.exhausted = True
+                break
+            rows, data = block
+            chunks.append(data)
+            length += len(data)
+            self.bytes_read += len(data)
+            self.rows += rows
+        if self.exhausted or self.bytes_read >= self.max_bytes:
+            chunks.append(self._trailer)
+            self._trailer = b''
+        return b''.join(chunks)
+    
+    def discard_pending(self) -> int:
+        """Drop the pre-fetched block if COPY never read it, returning its row count."""
+        block, self._pending = self._pending, None
+        return block[0] if block is not None else 0
+
 class AnyRORImporter:
     """Handles the import of AnyROR data into PostgreSQL database."""
     
-    def __init__(self, db_config: Dict[str, str], batch_size: int = 100):
+    def __init__(self, db_config: Dict[str, str], chunk_bytes: int = COPY_CHUNK_BYTES,
+                 writers: int = COPY_WRITERS):
         self.db_config = db_config
-        self.batch_size = batch_size
+        self.chunk_bytes = chunk_bytes
+        self.writers = max(1, writers)
+        # PyArrow already writes CSV in C; without it, binary COPY skips Python text formatting
+        self.copy_format = 'csv' if pacsv is not None else 'binary'
         self.connection_pool = None
         self.stats = {
             'total_records': 0,
@@ -52,9 +255,10 @@ class AnyRORImporter:
     def connect(self) -> None:
         """Establish database connection pool."""
         try:
-            self.connection_pool = SimpleConnectionPool(
+            # Thread-safe pool with a connection per COPY writer plus one spare
+            self.connection_pool = ThreadedConnectionPool(
                 minconn=1,
-                maxconn=10,
+                maxconn=max(10, self.writers + 1),
                 **self.db_config
             )
             logger.info("Database connection pool established")
@@ -93,6 +297,26 @@ class AnyRORImporter:
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
         
+        -- Template for the per-connection temporary staging tables used by COPY
+        CREATE UNLOGGED TABLE IF NOT EXISTS land_parcels_staging (
+            row_order INTEGER NOT NULL,
+            ulpin_id VARCHAR(64) NOT NULL,
+            village_name VARCHAR(255) NOT NULL,
+            survey_number VARCHAR(50) NOT NULL,
+            land_area DOUBLE PRECISION NOT NULL,
+            land_type VARCHAR(100),
+            owner_name VARCHAR(255) NOT NULL,
+            owner_aadhaar VARCHAR(12),
+            ownership_type VARCHAR(50),
+            mutation_date DATE,
+            registration_number VARCHAR(100),
+            document_type VARCHAR(100),
+            encumbrance_status VARCHAR(50),
+            verification_status VARCHAR(50),
+            nft_mint_address VARCHAR(44),
+            freeze_status VARCHAR(50)
+        );
+        
         -- Import Log table
         CREATE TABLE IF NOT EXISTS import_logs (
             id SERIAL PRIMARY KEY,
@@ -106,8 +330,8 @@ class AnyRORImporter:
             status VARCHAR(50) DEFAULT 'COMPLETED'
         );
         
-        -- Create indexes for performance
-        CREATE INDEX IF NOT EXISTS idx_land_parcels_ulpin ON land_parcels(ulpin_id);
+        -- Create indexes for performance (ulpin_id is already covered by its UNIQUE index)
+        DROP INDEX IF EXISTS idx_land_parcels_ulpin;
         CREATE INDEX IF NOT EXISTS idx_land_parcels_village ON land_parcels(village_name);
         CREATE INDEX IF NOT EXISTS idx_land_parcels_owner ON land_parcels(owner_name);
         CREATE INDEX IF NOT EXISTS idx_import_logs_batch ON import_logs(batch_id);
@@ -116,6 +340,7 @@ class AnyRORImporter:
         conn = self.connection_pool.getconn()
         try:
             with conn.cursor() as cursor:
+                self._drop_invalid_indexes(cursor)
                 cursor.execute(create_tables_sql)
                 conn.commit()
                 logger.info("Database tables created/verified successfully")
@@ -128,56 +353,303 @@ class AnyRORImporter:
     
     def validate_record(self, record: Dict[str, str]) -> Tuple[bool, List[str]]:
         """Validate a single AnyROR record."""
+        get = record.get
+        ulpin_id = get('ulpin_id') or ''
+        land_area = get('land_area') or 0
+        aadhaar = get('owner_aadhaar') or ''
+        
+        try:
+            area = float(land_area)
+        except (TypeError, ValueError):
+            area = None
+        
+        # Fast path: the overwhelming majority of rows are valid, so check
+        # everything with plain comparisons before building any error strings
+        if (len(ulpin_id) == 64 and area is not None and 0 < area <= MAX_LAND_AREA
+                and (not aadhaar or AADHAAR_RE.fullmatch(aadhaar))
+                and all((get(field) or '').strip() for field in REQUIRED_FIELDS)
+                and all(len(get(field) or '') <= limit for field, limit in COLUMN_MAX_LENGTHS.items())):
+            return True, []
+        
         errors = []
         
         # Required fields validation
-        required_fields = ['ulpin_id', 'village_name', 'survey_number', 'land_area', 'owner_name']
-        for field in required_fields:
-            if not record.get(field) or record[field].strip() == '':
+        for field in REQUIRED_FIELDS:
+            if not (get(field) or '').strip():
                 errors.append(f"Missing required field: {field}")
         
         # ULPIN ID format validation (64 characters)
-        ulpin_id = record.get('ulpin_id', '')
         if len(ulpin_id) != 64:
             errors.append(f"Invalid ULPIN ID length: {len(ulpin_id)} (expected 64)")
         
         # Land area validation
-        try:
-            land_area = float(record.get('land_area', 0))
-            if land_area <= 0:
-                errors.append("Land area must be greater than 0")
-        except ValueError:
+        if area is None:
             errors.append("Invalid land area format")
+        elif area <= 0:
+            errors.append("Land area must be greater than 0")
+        elif not area <= MAX_LAND_AREA:
+            errors.append(f"Land area exceeds {MAX_LAND_AREA}")
         
         # Aadhaar validation (if provided)
-        aadhaar = record.get('owner_aadhaar', '')
-        if aadhaar and (len(aadhaar) != 12 or not aadhaar.isdigit()):
+        if aadhaar and not AADHAAR_RE.fullmatch(aadhaar):
             errors.append("Invalid Aadhaar number format")
         
-        return len(errors) == 0, errors
+        # Column length validation
+        for field, limit in COLUMN_MAX_LENGTHS.items():
+            length = len(get(field) or '')
+            if length > limit:
+                errors.append(f"{field} too long: {length} (max {limit})")
+        
+        return False, errors
     
     def generate_ulpin_id(self, village: str, survey: str, owner: str) -> str:
         """Generate a deterministic ULPIN ID if not provided."""
         combined = f"{village}_{survey}_{owner}".encode('utf-8')
         return hashlib.sha256(combined).hexdigest()
     
-    def insert_batch(self, records: List[Dict[str, str]], batch_id: str) -> Tuple[int, int]:
-        """Insert a batch of records into the database."""
-        if not records:
-            return 0, 0
-        
-        insert_sql = """
-        INSERT INTO land_parcels (
-            ulpin_id, village_name, survey_number, land_area, land_type,
-            owner_name, owner_aadhaar, ownership_type, mutation_date,
-            registration_number, document_type, encumbrance_status,
-            verification_status, nft_mint_address, freeze_status
-        ) VALUES (
-            %(ulpin_id)s, %(village_name)s, %(survey_number)s, %(land_area)s, %(land_type)s,
-            %(owner_name)s, %(owner_aadhaar)s, %(ownership_type)s, %(mutation_date)s,
-            %(registration_number)s, %(document_type)s, %(encumbrance_status)s,
-            %(verification_status)s, %(nft_mint_address)s, %(freeze_status)s
-        ) ON CONFLICT (ulpin_id) DO UPDATE SET
+    def prepare_record(self, record: Dict[str, str]) -> Optional[List]:
+        """Validate a record and return its values in LAND_PARCEL_COLUMNS order, or None if invalid."""
+        # Validate record
+        is_valid, errors = self.validate_record(record)
+        if not is_valid:
+            logger.warning(f"Record validation failed: {errors}")
+            return None
+        
+        # Generate ULPIN ID if not provided
+        if not record.get('ulpin_id'):
+            record['ulpin_id'] = self.generate_ulpin_id(
+                record['village_name'],
+                record['survey_number'],
+                record['owner_name']
+            )
+        
+        # Convert land_area to float
+        record['land_area'] = float(record['land_area'])
+        
+        # Handle date conversion
+        if record.get('mutation_date'):
+            record['mutation_date'] = parse_mutation_date(record['mutation_date'])
+        
+        return [record.get(column) for column in LAND_PARCEL_COLUMNS]
+    
+    def partition_for(self, ulpin_id: str) -> int:
+        """COPY writer responsible for a ULPIN, so concurrent upserts never share a key."""
+        return hash(ulpin_id) % self.writers
+    
+    def _encode_record(self, writer, sink: _LineSink, row_order: int,
+                       record: Dict[str, str]) -> Optional[Tuple[int, bytes]]:
+        """Encode one record as a staging COPY row, counting it in the import stats."""
+        self.stats['total_records'] += 1
+        try:
+            row = self.prepare_record(record)
+        except Exception as e:
+            logger.error(f"Failed to stage record: {e}")
+            row = None
+        if row is None:
+            self.stats['failed_records'] += 1
+            return None
+        if self.copy_format == 'binary':
+            return self.partition_for(row[0]), encode_binary_row(row_order, row)
+        writer.writerow([row_order] + row)
+        return self.partition_for(row[0]), sink.line.encode('utf-8')
+    
+    def encode_records(self, records: Iterable[Dict[str, str]]) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield valid records as (partition, 1, encoded row) for the staging COPY."""
+        sink = _LineSink()
+        # Empty unquoted CSV fields are loaded as NULL
+        writer = csv.writer(sink, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+        
+        for row_order, record in enumerate(records):
+            encoded = self._encode_record(writer, sink, row_order, record)
+            if encoded is not None:
+                yield encoded[0], 1, encoded[1]
+    
+    def _arrow_valid_mask(self, table):
+        """Vectorised equivalent of validate_record over a PyArrow table."""
+        def non_blank(column):
+            trimmed = pc.utf8_trim_whitespace(table.column(column))
+            return pc.fill_null(pc.greater(pc.utf8_length(trimmed), 0), False)
+        
+        mask = pc.fill_null(pc.equal(pc.utf8_length(table.column('ulpin_id')), 64), False)
+        for field in REQUIRED_FIELDS:
+            mask = pc.and_(mask, non_blank(field))
+        
+        land_area = pc.utf8_trim_whitespace(table.column('land_area'))
+        numeric = pc.fill_null(pc.match_substring_regex(land_area, LAND_AREA_PATTERN), False)
+        area = pc.cast(pc.if_else(numeric, land_area, '0'), pa.float64())
+        in_range = pc.and_(pc.greater(area, 0), pc.less_equal(area, MAX_LAND_AREA))
+        mask = pc.and_(mask, pc.and_(numeric, in_range))
+        
+        for field, limit in COLUMN_MAX_LENGTHS.items():
+            fits = pc.less_equal(pc.utf8_length(table.column(field)), limit)
+            mask = pc.and_(mask, pc.fill_null(fits, True))
+        
+        aadhaar = table.column('owner_aadhaar')
+        aadhaar_ok = pc.or_(pc.equal(aadhaar, ''), pc.match_substring_regex(aadhaar, AADHAAR_PATTERN))
+        return pc.and_(mask, pc.fill_null(aadhaar_ok, True))
+    
+    def _arrow_normalise(self, table):
+        """Apply prepare_record's conversions to already-validated rows."""
+        columns = [table.column('row_order')]
+        for name in LAND_PARCEL_COLUMNS:
+            column = table.column(name)
+            if name == 'land_area':
+                column = pc.cast(pc.utf8_trim_whitespace(column), pa.float64())
+            elif name == 'mutation_date':
+                parsed = pc.strptime(column, format='%Y-%m-%d', unit='s', error_is_null=True)
+                column = pc.cast(parsed, pa.date32())
+            else:
+                # Arrow quotes empty strings; nulls are written bare so COPY loads NULL
+                column = pc.if_else(pc.equal(column, ''), pa.scalar(None, pa.string()), column)
+            columns.append(column)
+        return pa.table(columns, names=['row_order', *LAND_PARCEL_COLUMNS])
+    
+    def _skip_malformed_row(self, row) -> str:
+        """Count a CSV row PyArrow could not split into columns as failed and skip it."""
+        self.stats['total_records'] += 1
+        self.stats['failed_records'] += 1
+        logger.warning(f"Skipping malformed CSV row {row.number}: expected {row.expected_columns} "
+                       f"columns, got {row.actual_columns}")
+        return 'skip'
+    
+    def encode_arrow_batches(self, file_path: str) -> Iterator[Tuple[int, int, bytes]]:
+        """Parse the CSV with PyArrow and yield each batch's valid rows as one CSV block per partition."""
+        reader = pacsv.open_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+            # Quoted newlines are legal CSV, as they are for csv.DictReader;
+            # rows with the wrong number of fields fail alone instead of aborting the file
+            parse_options=pacsv.ParseOptions(
+                newlines_in_values=True,
+                invalid_row_handler=self._skip_malformed_row
+            ),
+            convert_options=pacsv.ConvertOptions(
+                column_types={column: pa.string() for column in LAND_PARCEL_COLUMNS},
+                include_columns=list(LAND_PARCEL_COLUMNS),
+                # Absent columns come through as nulls, which is where defaults apply
+                include_missing_columns=True
+            )
+        )
+        write_options = pacsv.WriteOptions(include_header=False)
+        sink = _LineSink()
+        writer = csv.writer(sink, quoting=csv.QUOTE_MINIMAL, lineterminator='\n')
+        offset = 0
+        
+        for batch in reader:
+            table = pa.Table.from_batches([batch])
+            table = table.append_column(
+                'row_order', pa.array(range(offset, offset + table.num_rows), pa.int64())
+            )
+            offset += table.num_rows
+            valid = self._arrow_valid_mask(table)
+            
+            accepted = self._arrow_normalise(table.filter(valid))
+            if accepted.num_rows:
+                self.stats['total_records'] += accepted.num_rows
+                partitions = pa.array(
+                    [self.partition_for(ulpin_id) for ulpin_id in accepted.column('ulpin_id').to_pylist()]
+                )
+                for partition in range(self.writers):
+                    part = accepted.filter(pc.equal(partitions, partition))
+                    if part.num_rows:
+                        buf = io.BytesIO()
+                        pacsv.write_csv(part, buf, write_options)
+                        yield partition, part.num_rows, buf.getvalue()
+            
+            # Rejected rows take the per-record path, which logs why each one failed
+            for record in table.filter(pc.invert(valid)).to_pylist():
+                row_order = record.pop('row_order')
+                record = {key: value for key, value in record.items() if value is not None}
+                encoded = self._encode_record(writer, sink, row_order, record)
+                if encoded is not None:
+                    yield encoded[0], 1, encoded[1]
+    
+    def encode_file(self, file_path: str) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield encoded staging CSV blocks for every valid row in the input file."""
+        if pacsv is not None:
+            yield from self.encode_arrow_batches(file_path)
+            return
+        
+        with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+            yield from self.encode_records(csv.DictReader(csvfile))
+    
+    def _produce_blocks(self, file_path: str, queues: List[queue.Queue], stop: threading.Event) -> None:
+        """Parsing stage: encode the file and queue it per partition in PIPELINE_BLOCK_BYTES blocks."""
+        pending = [[] for _ in queues]
+        rows = [0] * len(queues)
+        sizes = [0] * len(queues)
+        try:
+            for partition, count, data in self.encode_file(file_path):
+                if stop.is_set():
+                    return
+                pending[partition].append(data)
+                rows[partition] += count
+                sizes[partition] += len(data)
+                if sizes[partition] >= PIPELINE_BLOCK_BYTES:
+                    queues[partition].put((rows[partition], b''.join(pending[partition])))
+                    pending[partition] = []
+                    rows[partition] = 0
+                    sizes[partition] = 0
+            for partition, blocks in enumerate(queues):
+                if pending[partition] and not stop.is_set():
+                    blocks.put((rows[partition], b''.join(pending[partition])))
+        finally:
+            # Sentinels so every COPY writer stops even if encoding raised
+            for blocks in queues:
+                blocks.put(None)
+    
+    def _copy_partition(self, blocks: queue.Queue, batch_id: str, stop: threading.Event) -> Tuple[int, int]:
+        """COPY stage for one partition: stream its queued blocks through copy_batch."""
+        imported_records = 0
+        failed_records = 0
+        lines = iter(blocks.get, None)
+        framing = (BINARY_COPY_HEADER, BINARY_COPY_TRAILER) if self.copy_format == 'binary' else ()
+        
+        try:
+            # Stream validated rows straight into COPY, one chunk of encoded bytes at a time
+            while True:
+                stream = _CopyStream(lines, self.chunk_bytes, *framing)
+                if stream.exhausted:
+                    break
+                imported, failed = self.copy_batch(stream, batch_id)
+                imported_records += imported
+                failed_records += failed
+                
+                # Progress update
+                logger.info(f"Processed {self.stats['total_records']} records...")
+        except Exception:
+            # Stop the parser and keep draining so it never blocks on this queue
+            stop.set()
+            for _ in lines:
+                pass
+            raise
+        
+        return imported_records, failed_records
+    
+    def copy_batch(self, stream: _CopyStream, batch_id: str) -> Tuple[int, int]:
+        """COPY one chunk of encoded rows into staging and merge it into land_parcels."""
+        columns = ', '.join(LAND_PARCEL_COLUMNS)
+        # Each connection stages into its own temporary table, so writers never see
+        # (or truncate) each other's rows; ON COMMIT DELETE ROWS empties it per chunk
+        stage_sql = """
+        CREATE TEMP TABLE IF NOT EXISTS land_parcels_batch
+            (LIKE land_parcels_staging) ON COMMIT DELETE ROWS
+        """
+        copy_sql = (f"COPY land_parcels_batch (row_order, {columns}) "
+                    f"FROM STDIN WITH (FORMAT {self.copy_format.upper()})")
+        # Defaults are filled in server-side rather than per row in Python
+        staged = ', '.join(
+            f"COALESCE({column}, '{COLUMN_DEFAULTS[column]}')" if column in COLUMN_DEFAULTS else column
+            for column in LAND_PARCEL_COLUMNS
+        )
+        # DISTINCT ON keeps the last occurrence of a ULPIN within the chunk, since
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+        merge_sql = f"""
+        INSERT INTO land_parcels ({columns})
+        SELECT DISTINCT ON (ulpin_id) {staged}
+        FROM land_parcels_batch
+        ORDER BY ulpin_id, row_order DESC
+        ON CONFLICT (ulpin_id) DO UPDATE SET
             village_name = EXCLUDED.village_name,
             survey_number = EXCLUDED.survey_number,
             land_area = EXCLUDED.land_area,
@@ -193,65 +665,63 @@ class AnyRORImporter:
         """
         
         conn = self.connection_pool.getconn()
-        imported = 0
-        failed = 0
         
         try:
             with conn.cursor() as cursor:
-                for record in records:
-                    try:
-                        # Validate record
-                        is_valid, errors = self.validate_record(record)
-                        if not is_valid:
-                            logger.warning(f"Record validation failed: {errors}")
-                            failed += 1
-                            continue
-                        
-                        # Generate ULPIN ID if not provided
-                        if not record.get('ulpin_id'):
-                            record['ulpin_id'] = self.generate_ulpin_id(
-                                record['village_name'],
-                                record['survey_number'],
-                                record['owner_name']
-                            )
-                        
-                        # Set default values
-                        record.setdefault('land_type', 'Agricultural')
-                        record.setdefault('ownership_type', 'Individual')
-                        record.setdefault('encumbrance_status', 'CLEAR')
-                        record.setdefault('verification_status', 'PENDING')
-                        record.setdefault('freeze_status', 'UNFROZEN')
-                        
-                        # Convert land_area to float
-                        record['land_area'] = float(record['land_area'])
-                        
-                        # Handle date conversion
-                        if record.get('mutation_date'):
-                            try:
-                                record['mutation_date'] = datetime.strptime(
-                                    record['mutation_date'], '%Y-%m-%d'
-                                ).date()
-                            except ValueError:
-                                record['mutation_date'] = None
-                        
-                        cursor.execute(insert_sql, record)
-                        imported += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to insert record: {e}")
-                        failed += 1
-                
+                cursor.execute(stage_sql)
+                cursor.copy_expert(copy_sql, stream, size=1 << 20)
+                cursor.execute(merge_sql)
                 conn.commit()
-                logger.info(f"Batch {batch_id}: {imported} imported, {failed} failed")
+                logger.info(f"Batch {batch_id}: {stream.rows} rows ({stream.bytes_read} bytes) imported")
+                return stream.rows, 0
                 
         except Exception as e:
             logger.error(f"Batch insert failed: {e}")
             conn.rollback()
-            failed += len(records)
+            # A block pre-fetched before the failure was never sent, so it fails with the chunk
+            return 0, stream.rows + stream.discard_pending()
         finally:
             self.connection_pool.putconn(conn)
-        
-        return imported, failed
+    
+    def _drop_invalid_indexes(self, cursor, concurrently: bool = False) -> None:
+        """Drop any invalid BULK_LOAD_INDEXES so the following CREATE rebuilds them."""
+        cursor.execute(INVALID_INDEXES_SQL, (list(BULK_LOAD_INDEXES),))
+        for (name,) in cursor.fetchall():
+            logger.warning(f"Dropping invalid index {name} left by an interrupted build")
+            cursor.execute(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}")
+    
+    def drop_secondary_indexes(self) -> None:
+        """Drop the BULK_LOAD_INDEXES so an initial load only maintains the ULPIN key."""
+        conn = self.connection_pool.getconn()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"DROP INDEX IF EXISTS {', '.join(BULK_LOAD_INDEXES)}")
+                conn.commit()
+                logger.info("Secondary indexes dropped for initial load")
+        except Exception as e:
+            logger.error(f"Failed to drop secondary indexes: {e}")
+            conn.rollback()
+            raise
+        finally:
+            self.connection_pool.putconn(conn)
+    
+    def rebuild_secondary_indexes(self) -> None:
+        """Recreate the BULK_LOAD_INDEXES without blocking writes to land_parcels."""
+        conn = self.connection_pool.getconn()
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                self._drop_invalid_indexes(cursor, concurrently=True)
+                for name, target in BULK_LOAD_INDEXES.items():
+                    cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+                logger.info("Secondary indexes rebuilt")
+        except Exception as e:
+            logger.error(f"Failed to rebuild secondary indexes: {e}")
+            raise
+        finally:
+            conn.autocommit = False
+            self.connection_pool.putconn(conn)
     
     def log_import(self, batch_id: str, file_name: str, checksum: str) -> None:
         """Log import statistics to the database."""
@@ -279,50 +749,59 @@ class AnyRORImporter:
     
     def calculate_checksum(self, file_path: str) -> str:
         """Calculate SHA256 checksum of the input file."""
-        sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'sha256').hexdigest()
+            sha256_hash = hashlib.sha256()
+            for chunk in iter(lambda: f.read(CHECKSUM_CHUNK_BYTES), b""):
                 sha256_hash.update(chunk)
         return sha256_hash.hexdigest()
     
-    def import_file(self, file_path: str) -> None:
-        """Import data from CSV file."""
+    def import_file(self, file_path: str, initial_load: bool = False) -> None:
+        """Import data from CSV file, optionally deferring secondary index maintenance."""
         self.stats['start_time'] = time.time()
         batch_id = f"batch_{int(time.time())}"
         
         logger.info(f"Starting import of {file_path}")
         logger.info(f"Batch ID: {batch_id}")
         
-        # Calculate file checksum
-        checksum = self.calculate_checksum(file_path)
-        logger.info(f"File checksum: {checksum}")
+        if initial_load:
+            self.drop_secondary_indexes()
         
-        # Read and process CSV file
-        current_batch = []
+        # Checksum, parsing/validation and the COPY writers run concurrently:
+        # hashlib, PyArrow and libpq all release the GIL while they work
+        queues = [queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) for _ in range(self.writers)]
+        stop = threading.Event()
         
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            
-            for row_num, row in enumerate(reader, start=2):  # Start from 2 to account for header
-                self.stats['total_records'] += 1
-                current_batch.append(row)
+        try:
+            with ThreadPoolExecutor(max_workers=self.writers + 2) as executor:
+                checksum_future = executor.submit(self.calculate_checksum, file_path)
+                writer_futures = [
+                    executor.submit(self._copy_partition, blocks, batch_id, stop) for blocks in queues
+                ]
+                producer = executor.submit(self._produce_blocks, file_path, queues, stop)
                 
-                # Process batch when it reaches the batch size
-                if len(current_batch) >= self.batch_size:
-                    imported, failed = self.insert_batch(current_batch, batch_id)
-                    self.stats['imported_records'] += imported
-                    self.stats['failed_records'] += failed
-                    current_batch = []
-                    
-                    # Progress update
-                    if self.stats['total_records'] % 100 == 0:
-                        logger.info(f"Processed {self.stats['total_records']} records...")
-            
-            # Process remaining records
-            if current_batch:
-                imported, failed = self.insert_batch(current_batch, batch_id)
-                self.stats['imported_records'] += imported
-                self.stats['failed_records'] += failed
+                # Writers finish before their counters are merged into the shared stats
+                results = [future.result() for future in writer_futures]
+                producer.result()
+                checksum = checksum_future.result()
+        except BaseException as e:
+            logger.error(f"Import of {file_path} failed: {e!r}")
+            # Rebuild even after a failed load so the table is never left unindexed,
+            # but keep the load's error rather than a rebuild failure (already logged)
+            if initial_load:
+                try:
+                    self.rebuild_secondary_indexes()
+                except Exception:
+                    pass
+            raise
+        
+        if initial_load:
+            self.rebuild_secondary_indexes()
+        
+        logger.info(f"File checksum: {checksum}")
+        self.stats['imported_records'] += sum(imported for imported, _ in results)
+        self.stats['failed_records'] += sum(failed for _, failed in results)
         
         # Log import statistics
         self.stats['end_time'] = time.time()
@@ -342,7 +821,12 @@ def main():
     """Main function to run the AnyROR import process."""
     parser = argparse.ArgumentParser(description='Import AnyROR data into PostgreSQL')
     parser.add_argument('--input', required=True, help='Input CSV file path')
-    parser.add_argument('--batch-size', type=int, default=100, help='Batch size for processing')
+    parser.add_argument('--chunk-mb', type=int, default=COPY_CHUNK_BYTES // (1024 * 1024),
+                        help='Encoded CSV megabytes sent per COPY')
+    parser.add_argument('--initial-load', action='store_true',
+                        help='Drop secondary indexes during the load and rebuild them afterwards')
+    parser.add_argument('--writers', type=int, default=COPY_WRITERS,
+                        help='Concurrent COPY connections')
     parser.add_argument('--host', default='localhost', help='Database host')
     parser.add_argument('--port', type=int, default=5432, help='Database port')
     parser.add_argument('--database', default='gujarat_landchain', help='Database name')
@@ -361,7 +845,7 @@ def main():
     }
     
     # Initialize importer
-    importer = AnyRORImporter(db_config, args.batch_size)
+    importer = AnyRORImporter(db_config, args.chunk_mb * 1024 * 1024, args.writers)
     
     try:
         # Connect to database
@@ -371,7 +855,7 @@ def main():
         importer.create_tables()
         
         # Import data
-        importer.import_file(args.input)
+        importer.import_file(args.input, initial_load=args.initial_load)
         
         logger.info("AnyROR import completed successfully!")
         
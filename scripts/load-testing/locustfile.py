@@ -10,17 +10,52 @@ Usage:
     locust -f locustfile.py --host=http://localhost:3000
 """
 
-import json
 import random
 import time
+from collections import Counter
+import gevent
 from locust import HttpUser, task, between, events
 from typing import Dict, List
 
+# C-accelerated JSON for response bodies and request payloads when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Seconds between aggregated request summaries printed during a run
+STATS_FLUSH_INTERVAL = 5
+
+# Per-endpoint request counts since the last summary (greenlets share one thread)
+request_counts = Counter()
+request_failures = Counter()
+stats_flusher = None
+last_flush = time.monotonic()
+
+def json_body(response):
+    """Decode a response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def post_json(client, path, payload):
+    """POST a JSON payload, encoding it with orjson when available."""
+    if orjson is not None:
+        return client.post(path, data=orjson.dumps(payload), headers=JSON_HEADERS)
+    return client.post(path, json=payload)
+
 class LandChainUser(HttpUser):
     """Simulates a user interacting with the Gujarat LandChain system."""
     
     wait_time = between(1, 3)  # Wait 1-3 seconds between requests
     
+    # Choice pools built once per class rather than per task call
+    VILLAGES = ("Ahmedabad", "Surat", "Vadodara", "Rajkot")
+    TRANSFER_REASONS = ("Sale", "Gift", "Inheritance", "Partition")
+    NEW_OWNER_AADHAARS = tuple(f"987654321{suffix}" for suffix in range(100, 1000))
+    
     def on_start(self):
         """Initialize user session."""
         self.user_id = f"user_{random.randint(1000, 9999)}"
@@ -38,9 +73,9 @@ class LandChainUser(HttpUser):
         }
         
         try:
-            response = self.client.post("/api/auth/login", json=login_data)
+            response = post_json(self.client, "/api/auth/login", login_data)
             if response.status_code == 200:
-                self.session_data = response.json()
+                self.session_data = json_body(response)
                 self.client.headers.update({
                     "Authorization": f"Bearer {self.session_data.get('token', '')}"
                 })
@@ -54,11 +89,11 @@ class LandChainUser(HttpUser):
             response = self.client.get("/api/properties", params={
                 "page": random.randint(1, 10),
                 "limit": 20,
-                "village": random.choice(["Ahmedabad", "Surat", "Vadodara", "Rajkot"])
+                "village": random.choice(self.VILLAGES)
             })
             
             if response.status_code == 200:
-                properties = response.json().get("properties", [])
+                properties = json_body(response).get("properties", [])
                 if properties:
                     self.properties_viewed.extend([p["id"] for p in properties[:5]])
         except Exception as e:
@@ -76,9 +111,9 @@ class LandChainUser(HttpUser):
             response = self.client.get(f"/api/properties/{property_id}")
             
             if response.status_code == 200:
-                property_data = response.json()
+                property_data = json_body(response)
                 # Simulate user reading property details
-                time.sleep(random.uniform(0.5, 2.0))
+                gevent.sleep(random.uniform(0.5, 2.0))
         except Exception as e:
             print(f"Property details view failed: {e}")
     
@@ -95,7 +130,7 @@ class LandChainUser(HttpUser):
             
             if response.status_code == 200:
                 # Simulate map interaction
-                time.sleep(random.uniform(1.0, 3.0))
+                gevent.sleep(random.uniform(1.0, 3.0))
         except Exception as e:
             print(f"Property map view failed: {e}")
     
@@ -109,19 +144,17 @@ class LandChainUser(HttpUser):
         
         transfer_data = {
             "property_id": property_id,
-            "new_owner_aadhaar": f"987654321{random.randint(100, 999)}",
-            "transfer_reason": random.choice([
-                "Sale", "Gift", "Inheritance", "Partition"
-            ])
+            "new_owner_aadhaar": random.choice(self.NEW_OWNER_AADHAARS),
+            "transfer_reason": random.choice(self.TRANSFER_REASONS)
         }
         
         try:
-            response = self.client.post("/api/transfers/initiate", json=transfer_data)
+            response = post_json(self.client, "/api/transfers/initiate", transfer_data)
             
             if response.status_code == 200:
-                transfer_id = response.json().get("transfer_id")
+                transfer_id = json_body(response).get("transfer_id")
                 # Simulate transfer approval process
-                time.sleep(random.uniform(2.0, 5.0))
+                gevent.sleep(random.uniform(2.0, 5.0))
         except Exception as e:
             print(f"Transfer initiation failed: {e}")
     
@@ -134,9 +167,9 @@ class LandChainUser(HttpUser):
             })
             
             if response.status_code == 200:
-                transfers = response.json().get("transfers", [])
+                transfers = json_body(response).get("transfers", [])
                 # Simulate user reviewing transfer status
-                time.sleep(random.uniform(0.5, 1.5))
+                gevent.sleep(random.uniform(0.5, 1.5))
         except Exception as e:
             print(f"Transfer status check failed: {e}")
 
@@ -145,6 +178,10 @@ class AdminUser(HttpUser):
     
     wait_time = between(2, 5)  # Longer wait times for admin actions
     
+    # Choice pools built once per class rather than per task call
+    AUDIT_ACTION_TYPES = ("transfer", "approval", "login")
+    REPORT_TYPES = ("transfers", "properties", "users")
+    
     def on_start(self):
         """Initialize admin session."""
         self.admin_id = f"admin_{random.randint(100, 999)}"
@@ -159,9 +196,9 @@ class AdminUser(HttpUser):
         }
         
         try:
-            response = self.client.post("/api/admin/login", json=login_data)
+            response = post_json(self.client, "/api/admin/login", login_data)
             if response.status_code == 200:
-                self.session_data = response.json()
+                self.session_data = json_body(response)
                 self.client.headers.update({
                     "Authorization": f"Bearer {self.session_data.get('token', '')}"
                 })
@@ -178,9 +215,9 @@ class AdminUser(HttpUser):
             })
             
             if response.status_code == 200:
-                queue_data = response.json()
+                queue_data = json_body(response)
                 # Simulate admin reviewing queue
-                time.sleep(random.uniform(1.0, 3.0))
+                gevent.sleep(random.uniform(1.0, 3.0))
         except Exception as e:
             print(f"Approval queue view failed: {e}")
     
@@ -195,7 +232,7 @@ class AdminUser(HttpUser):
             })
             
             if response.status_code == 200:
-                transfers = response.json().get("transfers", [])
+                transfers = json_body(response).get("transfers", [])
                 if transfers:
                     transfer_ids = [t["id"] for t in transfers[:5]]
                     
@@ -205,11 +242,11 @@ class AdminUser(HttpUser):
                         "notes": "Batch approved by load test"
                     }
                     
-                    response = self.client.post("/api/admin/batch-approve", json=approval_data)
+                    response = post_json(self.client, "/api/admin/batch-approve", approval_data)
                     
                     if response.status_code == 200:
                         # Simulate processing time
-                        time.sleep(random.uniform(2.0, 4.0))
+                        gevent.sleep(random.uniform(2.0, 4.0))
         except Exception as e:
             print(f"Batch approval failed: {e}")
     
@@ -220,12 +257,12 @@ class AdminUser(HttpUser):
             response = self.client.get("/api/admin/audit-logs", params={
                 "start_date": "2025-01-01",
                 "end_date": "2025-01-27",
-                "action_type": random.choice(["transfer", "approval", "login"])
+                "action_type": random.choice(self.AUDIT_ACTION_TYPES)
             })
             
             if response.status_code == 200:
                 # Simulate admin reviewing logs
-                time.sleep(random.uniform(1.0, 2.0))
+                gevent.sleep(random.uniform(1.0, 2.0))
         except Exception as e:
             print(f"Audit log view failed: {e}")
     
@@ -234,13 +271,13 @@ class AdminUser(HttpUser):
         """Export reports."""
         try:
             response = self.client.get("/api/admin/export", params={
-                "report_type": random.choice(["transfers", "properties", "users"]),
+                "report_type": random.choice(self.REPORT_TYPES),
                 "format": "csv"
             })
             
             if response.status_code == 200:
                 # Simulate report generation time
-                time.sleep(random.uniform(3.0, 6.0))
+                gevent.sleep(random.uniform(3.0, 6.0))
         except Exception as e:
             print(f"Report export failed: {e}")
 
@@ -249,6 +286,10 @@ class DisputeUser(HttpUser):
     
     wait_time = between(3, 8)  # Longer wait times for dispute actions
     
+    # Choice pools built once per class rather than per task call
+    EVIDENCE_TYPES = ("document", "image", "witness_statement")
+    VOTES = ("approve", "reject", "abstain")
+    
     def on_start(self):
         """Initialize dispute user session."""
         self.dispute_id = f"dispute_{random.randint(1000, 9999)}"
@@ -262,9 +303,9 @@ class DisputeUser(HttpUser):
         }
         
         try:
-            response = self.client.post("/api/auth/login", json=login_data)
+            response = post_json(self.client, "/api/auth/login", login_data)
             if response.status_code == 200:
-                self.session_data = response.json()
+                self.session_data = json_body(response)
                 self.client.headers.update({
                     "Authorization": f"Bearer {self.session_data.get('token', '')}"
                 })
@@ -278,9 +319,9 @@ class DisputeUser(HttpUser):
             response = self.client.get(f"/api/disputes/{self.dispute_id}/status")
             
             if response.status_code == 200:
-                dispute_data = response.json()
+                dispute_data = json_body(response)
                 # Simulate user reviewing dispute
-                time.sleep(random.uniform(1.0, 2.0))
+                gevent.sleep(random.uniform(1.0, 2.0))
         except Exception as e:
             print(f"Dispute status view failed: {e}")
     
@@ -289,16 +330,16 @@ class DisputeUser(HttpUser):
         """Submit evidence for dispute."""
         evidence_data = {
             "dispute_id": self.dispute_id,
-            "evidence_type": random.choice(["document", "image", "witness_statement"]),
+            "evidence_type": random.choice(self.EVIDENCE_TYPES),
             "description": "Load test evidence submission"
         }
         
         try:
-            response = self.client.post("/api/disputes/evidence", json=evidence_data)
+            response = post_json(self.client, "/api/disputes/evidence", evidence_data)
             
             if response.status_code == 200:
                 # Simulate evidence processing
-                time.sleep(random.uniform(2.0, 4.0))
+                gevent.sleep(random.uniform(2.0, 4.0))
         except Exception as e:
             print(f"Evidence submission failed: {e}")
     
@@ -307,34 +348,60 @@ class DisputeUser(HttpUser):
         """Participate in governance voting."""
         vote_data = {
             "dispute_id": self.dispute_id,
-            "vote": random.choice(["approve", "reject", "abstain"]),
+            "vote": random.choice(self.VOTES),
             "reason": "Load test participation"
         }
         
         try:
-            response = self.client.post("/api/disputes/vote", json=vote_data)
+            response = post_json(self.client, "/api/disputes/vote", vote_data)
             
             if response.status_code == 200:
                 # Simulate voting process
-                time.sleep(random.uniform(1.0, 2.0))
+                gevent.sleep(random.uniform(1.0, 2.0))
         except Exception as e:
             print(f"Voting failed: {e}")
 
+def flush_request_stats():
+    """Print a summary of requests since the last flush and reset the counters."""
+    global last_flush
+    if not request_counts and not request_failures:
+        return
+    now = time.monotonic()
+    print(f"Requests: {sum(request_counts.values())} ok, "
+          f"{sum(request_failures.values())} failed in the last {now - last_flush:.1f}s")
+    last_flush = now
+    for name, count in request_failures.most_common(5):
+        print(f"  Failing: {name} x{count}")
+    request_counts.clear()
+    request_failures.clear()
+
+def flush_request_stats_periodically():
+    """Greenlet body that flushes request summaries every STATS_FLUSH_INTERVAL seconds."""
+    while True:
+        gevent.sleep(STATS_FLUSH_INTERVAL)
+        flush_request_stats()
+
 # Event handlers for monitoring
 @events.request.add_listener
 def my_request_handler(request_type, name, response_time, response_length, response, context, exception, start_time, url, **kwargs):
-    """Log request details for monitoring."""
+    """Count request outcomes; per-request detail is in locust's own stats."""
     if exception:
-        print(f"Request failed: {name} - {exception}")
+        request_failures[name] += 1
     else:
-        print(f"Request: {name} - {response_time}ms - {response.status_code}")
+        request_counts[name] += 1
 
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
     """Called when a test is starting."""
+    global stats_flusher, last_flush
     print("Load test starting for Gujarat LandChain...")
+    last_flush = time.monotonic()
+    stats_flusher = gevent.spawn(flush_request_stats_periodically)
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
     """Called when a test is ending."""
+    if stats_flusher is not None:
+        stats_flusher.kill()
+    flush_request_stats()
     print("Load test completed for Gujarat LandChain.") 
\ No newline at end of file